@@ -1,12 +1,44 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.exceptions import HTTPException
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import RedirectResponse
 import uvicorn
 
-from dmm_api.resources.dataset import router as dataset_router
+from dmm_api.resources.dataset import (
+    create_moma_client,
+    create_service_client,
+    router as dataset_router,
+    warm_up,
+)
 from dmm_api.resources.converter import router as converter_router
 from dmm_api.resources.security import router as security_router
+from dmm_api.tools.serialization import OrjsonResponse
+
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() in ("1", "true", "yes")
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "4"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share the outbound HTTP clients across requests for the app lifetime."""
+    app.state.moma_client = create_moma_client()
+    app.state.service_client = create_service_client()
+    # Warm up in the background so startup is not delayed by slow dependencies
+    warm_up_task = (
+        asyncio.create_task(warm_up(app.state.moma_client)) if STARTUP_WARMUP else None
+    )
+    try:
+        yield
+    finally:
+        if warm_up_task is not None and not warm_up_task.done():
+            warm_up_task.cancel()
+        await app.state.moma_client.aclose()
+        await app.state.service_client.aclose()
+
 
 app = FastAPI(
     title="Dataset API",
@@ -16,6 +48,14 @@ app = FastAPI(
     docs_url="/api/v1/swagger",
     redoc_url="/api/v1/redoc",
     root_path=os.getenv("ROOT_PATH", ""),
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse,
+)
+
+# Compress JSON and CSV responses for clients that accept gzip; small bodies are
+# sent as-is since compressing them saves nothing
+app.add_middleware(
+    GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL
 )
 
 
@@ -33,7 +73,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         body = detail
     else:
         body = {"code": exc.status_code, "error": str(detail)}
-    return JSONResponse(status_code=exc.status_code, content=body)
+    return OrjsonResponse(body, status_code=exc.status_code, headers=exc.headers)
 
 
 # Root
@@ -71,6 +111,11 @@ async def api_home():
                 "methods": ["POST"],
                 "url": "/api/v1/dataset/register",
             },
+            "dataset_register_bulk": {
+                "description": "Register several datasets in one request",
+                "methods": ["POST"],
+                "url": "/api/v1/dataset/register_bulk",
+            },
             "dataset_load": {
                 "description": "Move a dataset from the scratchpad",
                 "methods": ["PUT"],
@@ -131,6 +176,11 @@ async def api_home():
                 "methods": ["GET"],
                 "url": "/api/v1/polyglot/query/result/{dataset_id}",
             }, 
+            "polyglot/query/result/download": {
+                "description": "Download the result of a polyglot query as CSV",
+                "methods": ["GET"],
+                "url": "/api/v1/polyglot/query/result/{dataset_id}/download",
+            },
             "grafeo/test": {
                 "description": "Test endpoint for Grafeo integration",
                 "methods": ["GET"],
@@ -1,12 +1,10 @@
 import json
-import os
-import tempfile
 import structlog
 
 from fastapi import APIRouter, File, UploadFile, Query, HTTPException
-from fastapi.responses import Response
 from dmm_api.tools.PG2Croissant.parser import parse_profile
 from dmm_api.tools.PG2Croissant.mapper import map_to_croissant
+from dmm_api.tools.serialization import OrjsonResponse
 
 router = APIRouter()
 logger = structlog.get_logger(__name__)
@@ -20,13 +18,17 @@ def convertProfileFile(pgjson_path: str):
 
 
 def convertProfile(pgjson):
-    datasets = parse_profile(pgjson)
-    croissant_dict = map_to_croissant(datasets)
+    croissant_dict = convertProfileToDict(pgjson)
     croissant_jsonld = to_jsonld(croissant_dict)
 
     return croissant_jsonld
 
 
+def convertProfileToDict(pgjson) -> dict:
+    datasets = parse_profile(pgjson)
+    return map_to_croissant(datasets)
+
+
 def to_jsonld(croissant_dict: dict) -> str:
     return json.dumps(croissant_dict, indent=2)
 
@@ -47,23 +49,18 @@ async def convert(
             status_code=400, detail=f"Unsupported to format: {to_format}"
         )
 
-    temp_dir = tempfile.gettempdir()
-    pg_json = os.path.join(temp_dir, file.filename)
-    logger.info(f"Saving uploaded file to {pg_json}")
+    logger.info(f"Converting uploaded file {file.filename}")
 
     try:
-        with open(pg_json, "wb") as f:
-            f.write(await file.read())
-
-        croissant_jsonld = convertProfileFile(pgjson_path=pg_json)
-        croissant_dict = json.loads(croissant_jsonld)
+        # Parsed in memory and converted straight to a dict, without a temporary
+        # file or a JSON-LD string that would only be parsed back
+        pgjson = json.loads(await file.read())
+        croissant_dict = convertProfileToDict(pgjson)
         response_data = {
             "message": f"Converted from {from_format} to {to_format} successfully",
             "output": croissant_dict,
         }
-        return Response(
-            content=json.dumps(response_data), media_type="application/json"
-        )
+        return OrjsonResponse(response_data)
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         raise
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import date
 from enum import Enum
 import json
@@ -6,7 +7,8 @@ import re
 import time
 from pathlib import Path
 import shutil
-from dmm_api.resources.converter import convertProfile
+import threading
+from dmm_api.resources.converter import convertProfileToDict
 import requests
 import sqlglot
 from sqlglot.optimizer import optimize
@@ -33,14 +35,15 @@ from fastapi import (
     HTTPException,
     Query,
     Request,
+    Response,
     UploadFile,
     status,
     Depends,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 import httpx
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
 
 import dmm_api.resources.security as security
 
@@ -50,6 +53,7 @@ from ..tools.AP.parse_AP import (
     extract_from_AP,
     APRequest,
     group_datasets_by_components,
+    is_valid_uuid,
     json_to_graph,
 )
 
@@ -72,8 +76,26 @@ from ..tools.AP.generate_AP import (
 from ..tools.AP.generate_AP import generate_update_AP
 from ..tools.S3.scratchpad import upload_dataset_to_scratchpad
 
-from ..tools.S3.results import upload_csv_to_results, upload_ap_to_results, get_results_uuid
+from ..tools.S3.results import (
+    get_results_folder,
+    upload_dataframe_to_results,
+    upload_ap_to_results,
+    copy_results_csv,
+    remove_results,
+    get_results_csv_path,
+    get_results_uuid,
+    open_results_uuid,
+)
 from ..tools.S3.catalogue import upload_dataset_to_catalogue
+from ..tools.cache import SingleFlight, TTLCache
+from ..tools.serialization import (
+    OrjsonResponse,
+    dumps_json,
+    json_etag,
+    loads_json,
+    raw_json,
+)
+from ..tools.transport import BoundedTransport
 
 logger = structlog.get_logger(__name__)
 
@@ -211,6 +233,147 @@ class DatasetState(str, Enum):
     Staged = "staged"
 
 
+# Pre-built MoMa query parameters for each enum member, so the search handler
+# does a dict lookup per filter value instead of resolving `.value` each time
+_PROPERTY_PARAMS = {m: ("properties", m.value) for m in DatasetProperty}
+_TYPE_PARAMS = {m: ("types", m.value) for m in DatasetType}
+_ORDER_BY_PARAMS = {m: ("orderBy", m.value) for m in DatasetOrderBy}
+_MIME_TYPE_PARAMS = {m: ("mimeTypes", m.value) for m in MimeType}
+_OPERATOR_LABEL_VALUES = [m.value for m in OPERATOR_LABELS]
+
+
+def error_detail(
+    code: int, error: str, details: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build an HTTPException detail payload with the shape of an ErrorEnvelope.
+
+    The dict is built directly rather than through the Pydantic model, as the
+    envelope is only ever dumped again when the error response is rendered.
+    """
+    detail: Dict[str, Any] = {"code": code, "error": error}
+    if details is not None:
+        detail["details"] = details
+    return detail
+
+
+# Error payloads with a fixed message, built once instead of on every failing request.
+# They are shared between requests and must not be mutated.
+_ERR_UNEXPECTED = error_detail(
+    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    error="Unexpected Internal Server error",
+)
+_ERR_NO_DATASET_NODE = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="No Dataset node found in AP",
+)
+_ERR_REGISTER_SINGLE_DATASET = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="Register AP must contain exactly one Dataset node.",
+)
+_ERR_REGISTER_BULK_EMPTY = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="Bulk register request must contain at least one AP.",
+)
+_ERR_NO_DATASET_OBJECTS = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="No Dataset/FileObject/RecordSet nodes found in AP",
+)
+_ERR_NO_DATASET_NODES = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="No Dataset nodes found in AP",
+)
+_ERR_MISSING_AP = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="Request must include either a JSON file upload or JSON body with 'ap' field",
+)
+_ERR_MISSING_JSON_PAYLOAD = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="Request must include a valid JSON payload as file upload or request body.",
+)
+_ERR_AP_NOT_OBJECT = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="The AP payload must be a JSON object.",
+)
+_ERR_MISSING_BODY_OR_FILE = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="You must provide either 'body' or 'file'.",
+)
+_ERR_UNPARSABLE_PAYLOAD = error_detail(
+    code=status.HTTP_400_BAD_REQUEST,
+    error="Unable to parse request payload.",
+)
+
+
+def moma_http_error(
+    e: httpx.HTTPStatusError, log_event: str, error: str, **context: Any
+) -> HTTPException:
+    """
+    Log an error status returned by MoMa and build the 502 raised to the caller.
+
+    Args:
+        e: The error raised by `response.raise_for_status()`.
+        log_event: The structured log event to record.
+        error: The message of the error envelope.
+        **context: Identifiers of the request (e.g. `dataset_id`), added to both
+            the log entry and the error details.
+    """
+    logger.error(
+        log_event,
+        status_code=e.response.status_code,
+        response_text=e.response.text,
+        **context,
+    )
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail=error_detail(
+            code=status.HTTP_502_BAD_GATEWAY,
+            error=error,
+            details={
+                **context,
+                "moma_status_code": e.response.status_code,
+                "moma_response": e.response.text,
+            },
+        ),
+    )
+
+
+def moma_request_error(
+    e: httpx.RequestError,
+    log_event: str,
+    error: str = "Failed to connect to MoMa API",
+    **context: Any,
+) -> HTTPException:
+    """
+    Log a failure to reach MoMa and build the 503 raised to the caller.
+
+    Args:
+        e: The transport error raised by httpx.
+        log_event: The structured log event to record.
+        error: The message of the error envelope.
+        **context: Identifiers of the request (e.g. `dataset_id`), added to both
+            the log entry and the error details.
+    """
+    logger.error(
+        log_event,
+        error_type=type(e).__name__,
+        error=str(e),
+        timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
+        **context,
+    )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=error_detail(
+            code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error=error,
+            details={
+                **context,
+                "request_error_type": type(e).__name__,
+                "request_error": str(e),
+            },
+        ),
+    )
+
+
 router = APIRouter()
 
 
@@ -220,8 +383,104 @@ IDD_URL = os.getenv("IDD_URL", "https://datagems-dev.scayle.es/in-dataset-discov
 QD_URL = os.getenv("QD_URL", "https://datagems-dev.scayle.es/query-disambiguation")
 REC_SYS_URL = os.getenv("REC_SYS_URL", "https://datagems-dev.scayle.es/dataset-recsys")
 MOMA_REQUEST_TIMEOUT_SECONDS = 300.0
+# Largest page MoMa returns for a dataset search
+MOMA_MAX_PAGE_SIZE = 100
+MOMA_CONNECT_TIMEOUT_SECONDS = float(os.getenv("MOMA_CONNECT_TIMEOUT_SECONDS", "3"))
+MOMA_POOL_TIMEOUT_SECONDS = float(os.getenv("MOMA_POOL_TIMEOUT_SECONDS", "5"))
+MOMA_MAX_CONNECTIONS = int(os.getenv("MOMA_MAX_CONNECTIONS", "200"))
+MOMA_MAX_KEEPALIVE = int(os.getenv("MOMA_MAX_KEEPALIVE", "50"))
+MOMA_KEEPALIVE_EXPIRY = float(os.getenv("MOMA_KEEPALIVE_EXPIRY", "30"))
+MOMA_HTTP2 = os.getenv("MOMA_HTTP2", "true").lower() in ("1", "true", "yes")
+MOMA_MAX_INFLIGHT = min(int(os.getenv("MOMA_MAX_INFLIGHT", "50")), MOMA_MAX_CONNECTIONS)
+MOMA_WARMUP_CONNECTIONS = min(int(os.getenv("MOMA_WARMUP_CONNECTIONS", "4")), MOMA_MAX_KEEPALIVE)
 REQUEST_TIMEOUT_SECONDS = 300.0
 GRAFEO_URL = os.getenv("GRAFEO_URL", "http://localhost:7474")
+DATASET_CACHE_TTL_SECONDS = float(os.getenv("DATASET_CACHE_TTL_SECONDS", "30"))
+DATASET_CACHE_MAX_ENTRIES = int(os.getenv("DATASET_CACHE_MAX_ENTRIES", "1024"))
+DATASET_HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv("DATASET_HTTP_CACHE_MAX_AGE_SECONDS", "15"))
+DATASET_NOT_FOUND_CACHE_TTL_SECONDS = float(
+    os.getenv("DATASET_NOT_FOUND_CACHE_TTL_SECONDS", "30")
+)
+LOAD_PARALLELISM = max(int(os.getenv("LOAD_PARALLELISM", "4")), 1)
+QUERY_RESULT_CACHE_TTL_SECONDS = float(os.getenv("QUERY_RESULT_CACHE_TTL_SECONDS", "60"))
+QUERY_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_RESULT_CACHE_MAX_ENTRIES", "32"))
+QUERY_RESULT_STREAM_CHUNK_SIZE = 1024 * 1024
+# Defaults to one MoMa page, so the existence check of a bulk register is one request
+REGISTER_BULK_MAX_DATASETS = int(
+    os.getenv("REGISTER_BULK_MAX_DATASETS", str(MOMA_MAX_PAGE_SIZE))
+)
+
+# (metadata, etag) retrieved from MoMa, keyed by (token subject, dataset_id)
+_dataset_cache = TTLCache(
+    maxsize=DATASET_CACHE_MAX_ENTRIES, ttl_seconds=DATASET_CACHE_TTL_SECONDS
+)
+# (search results, etag) retrieved from MoMa, keyed by (token subject, query params)
+_search_cache = TTLCache(
+    maxsize=DATASET_CACHE_MAX_ENTRIES, ttl_seconds=DATASET_CACHE_TTL_SECONDS
+)
+# Dataset reads MoMa answered with 404, keyed like _dataset_cache, so repeated
+# lookups of unknown IDs are answered without a MoMa round-trip
+_missing_datasets = TTLCache(
+    maxsize=DATASET_CACHE_MAX_ENTRIES, ttl_seconds=DATASET_NOT_FOUND_CACHE_TTL_SECONDS
+)
+# Concurrent cache misses for the same key share a single MoMa request
+_dataset_fetches = SingleFlight()
+_search_fetches = SingleFlight()
+
+
+def invalidate_dataset_caches(dataset_ids: Iterable[str]) -> None:
+    """Drop cached MoMa reads after datasets have been registered, loaded or updated.
+
+    Only the given datasets are evicted from the per-dataset caches, for every
+    caller; search and query results are all dropped, as any of them may depend
+    on the written datasets.
+    """
+    dataset_ids = set(dataset_ids)
+    # Keys are (token subject, dataset_id)
+    _dataset_cache.pop_matching(lambda key: key[1] in dataset_ids)
+    _missing_datasets.pop_matching(lambda key: key[1] in dataset_ids)
+    _search_cache.clear()
+    _query_results.clear()
+
+
+def not_modified_response(request: Request, headers: dict[str, str]) -> Optional[Response]:
+    """
+    Check the client's cached copy of a dataset or query result read against its ETag.
+
+    Returns:
+        A 304 response if the request's If-None-Match matches the ETag in
+        `headers`, otherwise None
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in client_etags or headers["ETag"] in client_etags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+def http_cache_headers(etag: str) -> dict[str, str]:
+    """Return the HTTP caching headers of a dataset or query result read"""
+    return {
+        "ETag": etag,
+        # Responses depend on the caller's token, so only private caches may keep them
+        "Cache-Control": f"private, max-age={DATASET_HTTP_CACHE_MAX_AGE_SECONDS}",
+    }
+
+
+def envelope_response(
+    content: Dict[str, Any],
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """
+    Serialize a success envelope straight to JSON with orjson.
+
+    Used by the endpoints whose payloads are already plain JSON (read through
+    from MoMa, Grafeo or the AP services) or an AP validated on the way in: it
+    skips building and re-validating the Pydantic envelope.
+    """
+    return OrjsonResponse(content, status_code=status_code, headers=headers)
 
 
 EXTERNAL_SERVICES = {
@@ -251,6 +510,111 @@ EXTERNAL_SERVICES = {
 CDD_EXCHANGE_SCOPE = os.getenv("CDD_EXCHANGE_SCOPE", "cross-dataset-discovery-api")
 
 
+def create_moma_client() -> httpx.AsyncClient:
+    """
+    Create the HTTP client used to talk to MoMa.
+
+    The application creates one client at startup and shares it between
+    requests (see `app.state.moma_client`), so connections are kept alive and
+    reused instead of being re-established on every call.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=MOMA_MAX_CONNECTIONS,
+            max_keepalive_connections=MOMA_MAX_KEEPALIVE,
+            keepalive_expiry=MOMA_KEEPALIVE_EXPIRY,
+        ),
+        # Multiplex concurrent MoMa calls over one connection when the server supports it
+        http2=MOMA_HTTP2,
+    )
+    return httpx.AsyncClient(
+        # Cap concurrent MoMa calls so request spikes queue here instead of at MoMa
+        transport=BoundedTransport(transport, max_inflight=MOMA_MAX_INFLIGHT),
+        # Reads and writes keep the long MoMa timeout; connecting and waiting for
+        # a free pooled connection fail fast instead
+        timeout=httpx.Timeout(
+            MOMA_REQUEST_TIMEOUT_SECONDS,
+            connect=MOMA_CONNECT_TIMEOUT_SECONDS,
+            pool=MOMA_POOL_TIMEOUT_SECONDS,
+        ),
+        follow_redirects=True,
+    )
+
+
+def create_service_client() -> httpx.AsyncClient:
+    """
+    Create the HTTP client shared by the handlers that forward APs to the
+    discovery, disambiguation and recommendation services.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            REQUEST_TIMEOUT_SECONDS,
+            connect=MOMA_CONNECT_TIMEOUT_SECONDS,
+            pool=MOMA_POOL_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=MOMA_MAX_CONNECTIONS,
+            max_keepalive_connections=MOMA_MAX_KEEPALIVE,
+            keepalive_expiry=MOMA_KEEPALIVE_EXPIRY,
+        ),
+        http2=MOMA_HTTP2,
+        follow_redirects=True,
+    )
+
+
+def get_moma_client(request: Request) -> httpx.AsyncClient:
+    """Dependency returning the shared MoMa client; override it in tests to mock MoMa"""
+    return request.app.state.moma_client
+
+
+def get_service_client(request: Request) -> httpx.AsyncClient:
+    """Dependency returning the shared client for the AP forwarding services"""
+    return request.app.state.service_client
+
+
+async def warm_up(moma_client: httpx.AsyncClient) -> None:
+    """
+    Prepare the expensive per-process resources before the first request needs them.
+
+    Fetches the JWKS used to validate tokens, opens MOMA_WARMUP_CONNECTIONS
+    connections to MoMa on the shared client and creates the shared DuckDB database. MoMa reads need the
+    caller's token, so no dataset data is fetched here. Failures are only logged;
+    the first request then pays the cost as it did before.
+    """
+    t0 = time.perf_counter()
+    try:
+        await security._get_jwks()
+    except Exception as e:
+        logger.warning("JWKS warm-up failed", error_type=type(e).__name__, error=str(e))
+
+    # Any response will do, the goal is established (TLS) connections in the pool.
+    # Concurrent requests each open their own connection over HTTP/1.1; over
+    # HTTP/2 they share a single one, which is all the client needs.
+    results = await asyncio.gather(
+        *(moma_client.head(MOMA_URL) for _ in range(max(MOMA_WARMUP_CONNECTIONS, 1))),
+        return_exceptions=True,
+    )
+    responses = [r for r in results if isinstance(r, httpx.Response)]
+    if responses:
+        # Shows whether MoMa negotiated HTTP/2 or the client fell back to HTTP/1.1
+        logger.info(
+            "MoMa connections warmed up",
+            http_version=responses[0].http_version,
+            succeeded=len(responses),
+            attempted=len(results),
+        )
+    else:
+        e = results[0]
+        logger.warning("MoMa warm-up failed", error_type=type(e).__name__, error=str(e))
+
+    try:
+        await asyncio.to_thread(lambda: get_duckdb_cursor().close())
+    except Exception as e:
+        logger.warning("DuckDB warm-up failed", error_type=type(e).__name__, error=str(e))
+
+    logger.info(f"[TIMER] Startup warm-up: {time.perf_counter() - t0:.4f}s")
+
+
 async def get_dataset_metadata(
     dataset_id: str,
     token: str,
@@ -280,10 +644,7 @@ async def get_dataset_metadata(
 
     should_close = client is None
     if client is None:
-        client = httpx.AsyncClient(
-            timeout=MOMA_REQUEST_TIMEOUT_SECONDS,
-            follow_redirects=True,
-        )
+        client = create_moma_client()
 
     try:
         response = await client.get(
@@ -301,7 +662,7 @@ async def get_dataset_metadata(
             return (False, {"nodes": [], "edges": []})
 
         response.raise_for_status()
-        data = response.json()
+        data = loads_json(response.content)
 
         nodes = data.get("nodes", [])
         edges = data.get("edges", [])
@@ -334,9 +695,102 @@ async def get_dataset_metadata(
             await client.aclose()
 
 
+async def find_existing_datasets(
+    dataset_ids: List[str],
+    token: str,
+    client: Optional[httpx.AsyncClient] = None,
+    dataset_status: Optional[str] = None,
+) -> set[str]:
+    """
+    Check which of the given datasets exist in Neo4j via MoMa API.
+
+    All IDs are sent in one search request (split in pages of MOMA_MAX_PAGE_SIZE
+    and issued concurrently for larger batches) instead of one request per dataset.
+
+    Args:
+        dataset_ids: The UUIDs of the datasets to check
+        token: The authorization token for the MoMa API
+        client: Optional httpx client to reuse. If None, creates a new one.
+        dataset_status: Optional status filter (e.g., 'staged', 'loaded', 'ready')
+
+    Returns:
+        The subset of `dataset_ids` found in MoMa
+    """
+    url = f"{MOMA_URL}datasets/"
+    unique_ids = list(dict.fromkeys(dataset_ids))
+    batches = [
+        unique_ids[i:i + MOMA_MAX_PAGE_SIZE]
+        for i in range(0, len(unique_ids), MOMA_MAX_PAGE_SIZE)
+    ]
+    logger.info(
+        "Checking datasets existence in MoMa",
+        dataset_ids_count=len(unique_ids),
+        dataset_status=dataset_status,
+        batches=len(batches),
+        timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
+    )
+
+    should_close = client is None
+    if client is None:
+        client = create_moma_client()
+
+    async def search_batch(batch: List[str]) -> set[str]:
+        params = [("nodeIds", dataset_id) for dataset_id in batch]
+        params += [("pageSize", len(batch)), ("properties", "id")]
+        if dataset_status:
+            params.append(("status", dataset_status))
+        response = await client.get(
+            url,
+            params=params,
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code == 404:
+            return set()
+        response.raise_for_status()
+        return {
+            str(dataset.get("id"))
+            for dataset in loads_json(response.content).get("datasets", [])
+        }
+
+    try:
+        results = await asyncio.gather(*(search_batch(batch) for batch in batches))
+        existing = set().union(*results) & set(unique_ids)
+        logger.info(
+            "Datasets existence check completed in MoMa",
+            dataset_ids_count=len(unique_ids),
+            existing_count=len(existing),
+        )
+        return existing
+
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "MoMa API HTTP error while checking datasets existence",
+            dataset_ids=unique_ids,
+            status_code=e.response.status_code,
+            response_text=e.response.text,
+        )
+        raise
+    except httpx.RequestError as e:
+        logger.error(
+            "MoMa API request error while checking datasets existence",
+            dataset_ids=unique_ids,
+            error_type=type(e).__name__,
+            error=str(e),
+            timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
+        )
+        raise
+    finally:
+        if should_close:
+            await client.aclose()
+
+
 # Endpoints
 # Temporary router to upload the dataset to S3/scratchpad
-@router.post("/data-workflow", response_model=DatasetSuccessEnvelope)
+@router.post(
+    "/data-workflow",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": DatasetSuccessEnvelope}},
+)
 async def data_workflow(
     file: UploadFile = File(...),
     file_name: str = Form(...),
@@ -344,21 +798,25 @@ async def data_workflow(
 ):
     """Handle data workflow by uploading files and assigning metadata."""
     try:
-        file_bytes = await file.read()
-        s3path = upload_dataset_to_scratchpad(file_bytes, file_name, dataset_id)
+        # Stream the spooled upload to the scratchpad instead of reading it into memory
+        s3path = await asyncio.to_thread(
+            upload_dataset_to_scratchpad, file.file, file_name, dataset_id
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Failed to upload dataset to scratchpad: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
-    return DatasetSuccessEnvelope(
-        code=status.HTTP_201_CREATED,
-        message=f"Dataset {file_name} uploaded successfully with ID {dataset_id} at {s3path}",
-        dataset={"id": dataset_id, "name": file_name, "archivedAt": s3path},
+    return envelope_response(
+        {
+            "code": status.HTTP_201_CREATED,
+            "message": f"Dataset {file_name} uploaded successfully with ID {dataset_id} at {s3path}",
+            "dataset": {"id": dataset_id, "name": file_name, "archivedAt": s3path},
+        }
     )
 
 
@@ -373,10 +831,16 @@ async def dataset_home():
     }
 
 
-@router.get("/dataset/search", response_model=DatasetsSuccessEnvelope)
+@router.get(
+    "/dataset/search",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": DatasetsSuccessEnvelope}},
+)
 async def search_datasets(
+    request: Request,
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client),
     nodeIds: Optional[List[str]] = Query(
         None, description="Filter datasets by their UUIDs."
     ),
@@ -429,13 +893,13 @@ async def search_datasets(
         params += [("nodeIds", nid) for nid in nodeIds]
 
     if properties:
-        params += [("properties", p.value) for p in properties]
+        params += [_PROPERTY_PARAMS[p] for p in properties]
 
     if types:
-        params += [("types", t.value) for t in types]
+        params += [_TYPE_PARAMS[t] for t in types]
 
     if orderBy:
-        params += [("orderBy", o.value) for o in orderBy]
+        params += [_ORDER_BY_PARAMS[o] for o in orderBy]
 
     if publishedDateFrom:
         params.append(("publishedFrom", publishedDateFrom.strftime("%Y-%m-%d")))
@@ -447,7 +911,7 @@ async def search_datasets(
         params.append(("status", dataset_status))
 
     # Convert offset/count to page/pageSize for MoMa (max pageSize is 100)
-    page_size = min(count, 100) if count is not None else 25
+    page_size = min(count, MOMA_MAX_PAGE_SIZE) if count is not None else 25
     params.append(("pageSize", page_size))
 
     if offset is not None:
@@ -459,7 +923,7 @@ async def search_datasets(
     params.append(("direction", "asc" if direction >= 0 else "desc"))
 
     if mimeTypes:
-        params += [("mimeTypes", m.value) for m in mimeTypes]
+        params += [_MIME_TYPE_PARAMS[m] for m in mimeTypes]
 
     logger.info(
         "Searching datasets in MoMa",
@@ -470,216 +934,205 @@ async def search_datasets(
         timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
     )
 
-    async with httpx.AsyncClient(
-        timeout=MOMA_REQUEST_TIMEOUT_SECONDS,
-        follow_redirects=True,
-    ) as client:
-        try:
-            response = await client.get(
-                url,
-                params=params,
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            response.raise_for_status()
+    cache_key = (token_payload.get("sub"), tuple(params))
+    try:
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            data, etag = cached
+            logger.info("Dataset search served from cache")
+        else:
+            async def fetch_search():
+                response = await client.get(
+                    url,
+                    params=params,
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+                # Answered directly, without building an HTTPStatusError to catch
+                if response.status_code == status.HTTP_404_NOT_FOUND:
+                    logger.error(
+                        "MoMa API HTTP error during dataset search",
+                        status_code=response.status_code,
+                        response_text=response.text,
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=error_detail(
+                            code=status.HTTP_404_NOT_FOUND,
+                            error="Dataset search target not found in MoMa",
+                            details={
+                                "moma_status_code": response.status_code,
+                                "moma_response": response.text,
+                            },
+                        ),
+                    )
+                response.raise_for_status()
 
-            data = response.json()
+                data = loads_json(response.content)
+                etag = json_etag(data)
+                _search_cache.set(cache_key, (data, etag))
+                return data, etag
 
-            datasets = data.get("datasets", [])
-            response_page = data.get("page", 1)
-            response_page_size = data.get("pageSize", page_size)
-            response_total = data.get("total", len(datasets))
-            response_offset = (response_page - 1) * response_page_size
-            logger.info(
-                "Dataset search completed",
-                status_code=response.status_code,
-                returned_count=len(datasets),
-                total=response_total,
-                page=response_page,
-                page_size=response_page_size,
-            )
+            data, etag = await _search_fetches.do(cache_key, fetch_search)
 
-            return DatasetsSuccessEnvelope(
-                code=status.HTTP_200_OK,
-                message=(
+        headers = http_cache_headers(etag)
+        not_modified = not_modified_response(request, headers)
+        if not_modified is not None:
+            return not_modified
+
+        datasets = data.get("datasets", [])
+        response_page = data.get("page", 1)
+        response_page_size = data.get("pageSize", page_size)
+        response_total = data.get("total", len(datasets))
+        response_offset = (response_page - 1) * response_page_size
+        logger.info(
+            "Dataset search completed",
+            cached=cached is not None,
+            returned_count=len(datasets),
+            total=response_total,
+            page=response_page,
+            page_size=response_page_size,
+        )
+
+        return envelope_response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": (
                     "No datasets found matching the search criteria"
                     if not datasets
                     else f"{len(datasets)} datasets retrieved successfully"
                 ),
-                datasets=datasets,
-                offset=response_offset,
-                count=len(datasets),
-                total=response_total,
-            )
-        
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "MoMa API HTTP error during dataset search",
-                status_code=e.response.status_code,
-                response_text=e.response.text,
-            )
-
-            if e.response.status_code == status.HTTP_404_NOT_FOUND:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ErrorEnvelope(
-                        code=status.HTTP_404_NOT_FOUND,
-                        error="Dataset search target not found in MoMa",
-                        details={
-                            "moma_status_code": e.response.status_code,
-                            "moma_response": e.response.text,
-                        },
-                    ).model_dump(exclude_none=True),
-                )
-
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error=f"Error from MoMa API: {e.response.status_code}",
-                    details={
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "MoMa API request error during dataset search",
-                error_type=type(e).__name__,
-                error=str(e),
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error="Failed to connect to MoMa API",
-                    details={
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                    },
-                ).model_dump(exclude_none=True),
-            )
+                "datasets": datasets,
+                "offset": response_offset,
+                "count": len(datasets),
+                "total": response_total,
+            },
+            headers=headers,
+        )
+    
+    except httpx.HTTPStatusError as e:
+        raise moma_http_error(
+            e,
+            "MoMa API HTTP error during dataset search",
+            f"Error from MoMa API: {e.response.status_code}",
+        )
+    except httpx.RequestError as e:
+        raise moma_request_error(e, "MoMa API request error during dataset search")
 
 # This endpoint for now does not support filtering
 # TODO: implement filtering by dataset state
-@router.get("/dataset/get/{dataset_id}", response_model=DatasetSuccessEnvelope)
+@router.get(
+    "/dataset/get/{dataset_id}",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": DatasetSuccessEnvelope}},
+)
 async def get_dataset(
+    request: Request,
     dataset_id: str,
     format: str = Query(None, alias="format"),
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client),
 ):
     """Return dataset with a specific ID from Neo4j via MoMa API"""
+    cache_key = (token_payload.get("sub"), dataset_id)
     logger.info(
         "Fetching dataset from MoMa",
         dataset_id=dataset_id,
         output_format=format,
         timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
     )
-    async with httpx.AsyncClient(
-        timeout=MOMA_REQUEST_TIMEOUT_SECONDS,
-        follow_redirects=True,
-    ) as client:
-        try:
-            response = await client.get(
-                f"{MOMA_URL}datasets/{dataset_id}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-
-            if response.status_code == status.HTTP_404_NOT_FOUND:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ErrorEnvelope(
-                        code=status.HTTP_404_NOT_FOUND,
-                        error=f"Dataset with ID {dataset_id} not found in Neo4j",
-                    ).model_dump(exclude_none=True),
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=error_detail(
+            code=status.HTTP_404_NOT_FOUND,
+            error=f"Dataset with ID {dataset_id} not found in Neo4j",
+        ),
+    )
+    try:
+        if _missing_datasets.get(cache_key):
+            logger.info("Dataset not found (cached)", dataset_id=dataset_id)
+            raise not_found
+
+        cached = _dataset_cache.get(cache_key)
+        if cached is not None:
+            metadata, etag = cached
+            logger.info("Dataset served from cache", dataset_id=dataset_id)
+        else:
+            async def fetch_dataset():
+                response = await client.get(
+                    f"{MOMA_URL}datasets/{dataset_id}",
+                    headers={"Authorization": f"Bearer {token}"},
                 )
 
-            response.raise_for_status()
-            metadata = response.json()
-            logger.info(
-                "Dataset fetch completed",
-                dataset_id=dataset_id,
-                status_code=response.status_code,
-                nodes_count=len(metadata.get("nodes", [])) if isinstance(metadata, dict) else None,
-            )
+                if response.status_code == status.HTTP_404_NOT_FOUND:
+                    _missing_datasets.set(cache_key, True)
+                    raise not_found
 
-            if format == "croissant":
-                croissant_jsonld = convertProfile(pgjson=metadata)
-                metadata = json.loads(croissant_jsonld)
+                response.raise_for_status()
+                metadata = loads_json(response.content)
+                etag = json_etag(metadata)
+                _dataset_cache.set(cache_key, (metadata, etag))
+                logger.info(
+                    "Dataset fetch completed",
+                    dataset_id=dataset_id,
+                    status_code=response.status_code,
+                    nodes_count=len(metadata.get("nodes", [])) if isinstance(metadata, dict) else None,
+                )
+                return metadata, etag
+
+            metadata, etag = await _dataset_fetches.do(cache_key, fetch_dataset)
+
+        if format:
+            # Each output format is a different representation of the same dataset
+            etag = f'{etag[:-1]}-{format}"'
+        headers = http_cache_headers(etag)
+        not_modified = not_modified_response(request, headers)
+        if not_modified is not None:
+            return not_modified
+
+        if format == "croissant":
+            metadata = convertProfileToDict(pgjson=metadata)
+
+        return envelope_response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": f"Dataset with ID {dataset_id} retrieved successfully from Neo4j",
+                "dataset": metadata,
+            },
+            headers=headers,
+        )
 
-            return DatasetSuccessEnvelope(
-                code=status.HTTP_200_OK,
-                message=f"Dataset with ID {dataset_id} retrieved successfully from Neo4j",
-                dataset=metadata,
-            )
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        raise moma_http_error(
+            e,
+            "MoMa API HTTP error during dataset fetch",
+            f"Error from MoMa API: {e.response.status_code}",
+            dataset_id=dataset_id,
+        )
+    except httpx.RequestError as e:
+        raise moma_request_error(
+            e, "MoMa API request error during dataset fetch", dataset_id=dataset_id
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=_ERR_UNEXPECTED,
+        )
 
-        except HTTPException:
-            raise
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error=f"Error from MoMa API: {e.response.status_code}",
-                    details={
-                        "dataset_id": dataset_id,
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "MoMa API request error during dataset fetch",
-                dataset_id=dataset_id,
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error="Failed to connect to MoMa API",
-                    details={
-                        "dataset_id": dataset_id,
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    error="Unexpected Internal Server error",
-                ).model_dump(exclude_none=True),
-            )
 
-
-@router.post(
-    "/dataset/register",
-    response_model=APSuccessEnvelope,
-    response_model_exclude_none=True
-)
-async def register_dataset(
-    wrapped: WrappedAPRequest,
-    token: str = Depends(security.oauth2_scheme),
-    token_payload: dict[str, Any] = Depends(security.require_app_scope)):
+def _parse_register_ap(ap_payload: APRequest) -> tuple[list, list, str]:
     """
-    Register a new dataset in Neo4j by:
-    1. Extracting the Dataset node from the AP
-    2. Checking it does not already exist → 409 if it does
-    3. Creating it via POST /datasets
+    Extract the Dataset node to register from an AP.
+
+    Returns:
+        The Dataset nodes and edges to post to MoMa, and the dataset ID
+
+    Raises:
+        HTTPException: 400 if the AP does not hold exactly one Dataset node with
+            a valid UUID, 500 on an unexpected extraction error
     """
-    ap_payload = wrapped.ap
-    logger.info(
-        "Register dataset request received",
-        timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-    )
-    
     try:
         # Extract only Dataset nodes
         filtered_nodes, filtered_edges = extract_from_AP(
@@ -689,23 +1142,26 @@ async def register_dataset(
         if not filtered_nodes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error="No Dataset node found in AP",
-                ).model_dump(exclude_none=True),
+                detail=_ERR_NO_DATASET_NODE,
             )
 
         if len(filtered_nodes) != 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error="Register AP must contain exactly one Dataset node.",
-                ).model_dump(exclude_none=True),
+                detail=_ERR_REGISTER_SINGLE_DATASET,
             )
 
         dataset_node = filtered_nodes[0]
         dataset_id = dataset_node.get("id")
+        # Reject a malformed ID before any call to MoMa
+        if not is_valid_uuid(str(dataset_id)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_detail(
+                    code=status.HTTP_400_BAD_REQUEST,
+                    error=f"Dataset ID {dataset_id} is not a valid UUID",
+                ),
+            )
         logger.info("Parsed dataset registration payload", dataset_id=dataset_id)
 
     # TODO: Validate that the file referenced in dataset's 'archivedAt' property actually exists
@@ -717,177 +1173,403 @@ async def register_dataset(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Unexpected error during the dataset extraction: {type(e).__name__}: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
+    return filtered_nodes, filtered_edges, dataset_id
 
-    async with httpx.AsyncClient(
-        timeout=MOMA_REQUEST_TIMEOUT_SECONDS,
-        follow_redirects=True,
-    ) as client:
-        # Check if dataset already exists
-        try:
-            exists, _ = await get_dataset_metadata(dataset_id, token=token, client=client)
 
-            if exists:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=ErrorEnvelope(
-                        code=status.HTTP_409_CONFLICT,
-                        error=f"Dataset with ID {dataset_id} already exists in Neo4j",
-                    ).model_dump(exclude_none=True),
-                )
-        except HTTPException:
-            raise
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "MoMa API HTTP error while checking dataset existence during register",
-                dataset_id=dataset_id,
-                status_code=e.response.status_code,
-                response_text=e.response.text,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error="MoMa API error while checking dataset existence",
-                    details={
-                        "dataset_id": dataset_id,
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "MoMa API request error while checking dataset existence during register",
-                dataset_id=dataset_id,
-                error_type=type(e).__name__,
-                error=str(e),
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error="Failed to connect to MoMa API while checking dataset existence",
-                    details={
-                        "dataset_id": dataset_id,
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    error=f"Unexpected error while checking dataset existence: {type(e).__name__}: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
+def _register_conflict(dataset_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=error_detail(
+            code=status.HTTP_409_CONFLICT,
+            error=f"Dataset with ID {dataset_id} already exists in Neo4j",
+        ),
+    )
+
+
+async def _find_registered_datasets(
+    dataset_ids: List[str], token: str, client: httpx.AsyncClient
+) -> set[str]:
+    """Return the subset of `dataset_ids` already in MoMa, mapping MoMa errors to HTTPException"""
+    try:
+        return await find_existing_datasets(dataset_ids, token=token, client=client)
+    except httpx.HTTPStatusError as e:
+        raise moma_http_error(
+            e,
+            "MoMa API HTTP error while checking dataset existence during register",
+            "MoMa API error while checking dataset existence",
+            dataset_ids=dataset_ids,
+        )
+    except httpx.RequestError as e:
+        raise moma_request_error(
+            e,
+            "MoMa API request error while checking dataset existence during register",
+            "Failed to connect to MoMa API while checking dataset existence",
+            dataset_ids=dataset_ids,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error=f"Unexpected error while checking dataset existence: {type(e).__name__}: {str(e)}",
+            ),
+        )
+
+
+async def _create_dataset(
+    filtered_nodes: list,
+    filtered_edges: list,
+    dataset_id: str,
+    token: str,
+    client: httpx.AsyncClient,
+) -> None:
+    """
+    Create the dataset node via POST /datasets.
+
+    Raises:
+        HTTPException: 409 if MoMa reports the dataset as created concurrently,
+            502/503 on MoMa errors, 500 on an unexpected error
+    """
+    try:
+        post_url = f"{MOMA_URL}datasets/"
+        post_data = {"nodes": filtered_nodes, "edges": filtered_edges}
+        logger.info(
+            "Creating dataset in MoMa",
+            dataset_id=dataset_id,
+            nodes_count=len(filtered_nodes),
+            edges_count=len(filtered_edges),
+        )
+
+        response = await client.post(
+            post_url,
+            content=dumps_json(post_data),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+        )
+
+        response.raise_for_status()
+        invalidate_dataset_caches([dataset_id])
+        logger.info(
+            "Dataset created in MoMa",
+            dataset_id=dataset_id,
+            status_code=response.status_code,
+        )
+
+        # Fake forward AP to AP Storage API
+        logger.info("AP be sent to AP Storage API")
+
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == status.HTTP_409_CONFLICT:
+            # The dataset was registered concurrently, after the existence check
+            logger.info("Dataset created concurrently in MoMa", dataset_id=dataset_id)
+            raise _register_conflict(dataset_id)
+        raise moma_http_error(
+            e,
+            "MoMa API HTTP error during dataset register",
+            f"Error from MoMa API (Status: {e.response.status_code})",
+            dataset_id=dataset_id,
+        )
+    except httpx.RequestError as e:
+        raise moma_request_error(
+            e, "MoMa API request error during dataset register", dataset_id=dataset_id
+        )
+    except Exception as e:
+        logger.error(
+            "Unexpected error during dataset register",
+            dataset_id=dataset_id,
+            error_type=type(e).__name__,
+            error=str(e),
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error=f"Unexpected error: {type(e).__name__}: {str(e)}",
+            ),
+        )
+
+
+def _register_success(ap_payload: APRequest, dataset_id: str) -> Dict[str, Any]:
+    return {
+        "code": status.HTTP_201_CREATED,
+        "message": f"Dataset with ID {dataset_id} registered successfully in Neo4j",
+        "ap": raw_json(ap_payload.model_dump_json(by_alias=True, exclude_defaults=True)),
+    }
+
+
+@router.post(
+    "/dataset/register",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APSuccessEnvelope}},
+)
+async def register_dataset(
+    wrapped: WrappedAPRequest,
+    token: str = Depends(security.oauth2_scheme),
+    token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client)):
+    """
+    Register a new dataset in Neo4j by:
+    1. Extracting the Dataset node from the AP
+    2. Checking it does not already exist → 409 if it does
+    3. Creating it via POST /datasets
+    """
+    ap_payload = wrapped.ap
+    logger.info(
+        "Register dataset request received",
+        timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
+    )
+
+    filtered_nodes, filtered_edges, dataset_id = _parse_register_ap(ap_payload)
+
+    # Check if dataset already exists
+    if dataset_id in await _find_registered_datasets([dataset_id], token, client):
+        raise _register_conflict(dataset_id)
 
-        # Create the dataset node via POST /datasets
+    await _create_dataset(filtered_nodes, filtered_edges, dataset_id, token, client)
+    return envelope_response(_register_success(ap_payload, dataset_id))
+
+
+@router.post(
+    "/dataset/register_bulk",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
+async def register_datasets_bulk(
+    wrapped: List[WrappedAPRequest],
+    token: str = Depends(security.oauth2_scheme),
+    token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client),
+):
+    """
+    Register several datasets in one request by:
+    1. Extracting the Dataset node from each AP
+    2. Checking which already exist with a single MoMa search for all of them
+    3. Creating the missing ones via concurrent POST /datasets
+
+    Each AP gets its own result, shaped like the /dataset/register response or
+    its error; the request only fails as a whole if the existence check does.
+    """
+    if not wrapped:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_ERR_REGISTER_BULK_EMPTY,
+        )
+    if len(wrapped) > REGISTER_BULK_MAX_DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_detail(
+                code=status.HTTP_400_BAD_REQUEST,
+                error=f"Bulk register request must contain at most {REGISTER_BULK_MAX_DATASETS} APs.",
+                details={"aps_count": len(wrapped)},
+            ),
+        )
+    logger.info(
+        "Bulk register datasets request received",
+        aps_count=len(wrapped),
+        timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
+    )
+
+    results: list[Optional[Dict[str, Any]]] = [None] * len(wrapped)
+    parsed: dict[int, tuple[list, list, str]] = {}
+    for index, item in enumerate(wrapped):
         try:
-            post_url = f"{MOMA_URL}datasets/"
-            post_data = {"nodes": filtered_nodes, "edges": filtered_edges}
-            logger.info(
-                "Creating dataset in MoMa",
-                dataset_id=dataset_id,
-                nodes_count=len(filtered_nodes),
-                edges_count=len(filtered_edges),
-            )
+            parsed[index] = _parse_register_ap(item.ap)
+        except HTTPException as e:
+            results[index] = e.detail
+
+    dataset_ids = [dataset_id for _, _, dataset_id in parsed.values()]
+    existing_ids = (
+        await _find_registered_datasets(dataset_ids, token, client)
+        if dataset_ids
+        else set()
+    )
 
-            response = await client.post(
-                post_url,
-                json=post_data,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+    # The first AP of each new dataset creates it; repeated IDs are conflicts
+    to_create: dict[str, int] = {}
+    for index, (_, _, dataset_id) in parsed.items():
+        if dataset_id in existing_ids or dataset_id in to_create:
+            results[index] = _register_conflict(dataset_id).detail
+        else:
+            to_create[dataset_id] = index
 
-            response.raise_for_status()
-            logger.info(
-                "Dataset created in MoMa",
-                dataset_id=dataset_id,
-                status_code=response.status_code,
+    async def create(index: int) -> None:
+        filtered_nodes, filtered_edges, dataset_id = parsed[index]
+        try:
+            await _create_dataset(
+                filtered_nodes, filtered_edges, dataset_id, token, client
             )
+        except HTTPException as e:
+            results[index] = e.detail
+        else:
+            results[index] = _register_success(wrapped[index].ap, dataset_id)
 
-            # Fake forward AP to AP Storage API
-            logger.info("AP be sent to AP Storage API")
+    # The MoMa client transport already bounds the requests in flight
+    await asyncio.gather(*(create(index) for index in to_create.values()))
 
-            return APSuccessEnvelope(
-                code=status.HTTP_201_CREATED,
-                message=f"Dataset with ID {dataset_id} registered successfully in Neo4j",
-                ap=ap_payload.model_dump(by_alias=True, exclude_defaults=True),
-            )
+    created = sum(
+        1 for result in results if result["code"] == status.HTTP_201_CREATED
+    )
+    return envelope_response(
+        {
+            "code": (
+                status.HTTP_201_CREATED
+                if created == len(results)
+                else status.HTTP_207_MULTI_STATUS
+            ),
+            "message": f"{created} of {len(results)} datasets registered successfully in Neo4j",
+            "content": {"results": results},
+        }
+    )
 
-        except HTTPException:
-            raise
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "MoMa API HTTP error during dataset register",
-                dataset_id=dataset_id,
-                status_code=e.response.status_code,
-                response_text=e.response.text,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error=f"Error from MoMa API (Status: {e.response.status_code})",
-                    details={
-                        "dataset_id": dataset_id,
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "MoMa API request error during dataset register",
-                dataset_id=dataset_id,
-                error_type=type(e).__name__,
-                error=str(e),
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error="Failed to connect to MoMa API",
-                    details={
-                        "dataset_id": dataset_id,
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except Exception as e:
-            logger.error(
-                "Unexpected error during dataset register",
-                dataset_id=dataset_id,
-                error_type=type(e).__name__,
-                error=str(e),
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    error=f"Unexpected error: {type(e).__name__}: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
 
 # TODO: check if dataset with such ID is already registered and is in "loaded" state
+# Bounds concurrent dataset moves so parallel loads do not thrash the S3 mount
+_dataset_moves = asyncio.Semaphore(LOAD_PARALLELISM)
+
+
+def _stat_if_exists(path: Path) -> Optional[os.stat_result]:
+    """Stat `path`, or return None if it does not exist (blocking)."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+async def _move_dataset_files(
+    source_path: Path, target_path: Path, dataset_id: str, force: bool
+) -> None:
+    """Move a dataset from the scratchpad to the dataset directory."""
+    # One stat per path, issued concurrently: each is a round-trip on the S3 mount
+    source_stat, target_stat = await asyncio.gather(
+        asyncio.to_thread(_stat_if_exists, source_path),
+        asyncio.to_thread(_stat_if_exists, target_path),
+    )
+    if source_stat is None:
+        raise FileNotFoundError(
+            f"Source dataset not found at expected location: {source_path}"
+        )
+
+    if target_stat is None:
+        # Moving across the S3 mount copies the data, keep it off the event loop
+        await asyncio.to_thread(shutil.move, str(source_path), str(target_path))
+        return
+
+    # If force is True and source and target are the same dataset, skip the move
+    if force and os.path.samestat(source_stat, target_stat):
+        return
+    raise FileExistsError(
+        f"Target dataset with id {dataset_id} has already been moved to: {target_path}"
+    )
+
+
+def _rollback_dataset_move(source_path: Path, target_path: Path) -> None:
+    """Move a loaded dataset back to its original location (blocking)."""
+    if target_path.exists():
+        shutil.move(str(target_path), str(source_path))
+
+
+def _load_update_error(
+    e: Exception,
+    rollback_error: Optional[Exception],
+    dataset_id: str,
+    dataset_path: str,
+    target_path: Path,
+) -> HTTPException:
+    """
+    Log a failed MoMa update during a dataset load and build the error raised to the caller.
+
+    MoMa error statuses map to 502, transport errors to 503 and anything else to 500.
+    A failed rollback of the moved files is reported in the message and details.
+    """
+    rollback_failed = rollback_error is not None
+    rollback_note = (
+        f" [ROLLBACK FAILED: {type(rollback_error).__name__}: {str(rollback_error)}. File may be orphaned at {target_path}]"
+        if rollback_failed
+        else ""
+    )
+    message = f"Dataset load failed during Neo4j update (file rolled back to {dataset_path}): "
+
+    if isinstance(e, httpx.HTTPStatusError):
+        logger.error(
+            "MoMa API HTTP error during dataset load",
+            dataset_id=dataset_id,
+            status_code=e.response.status_code,
+            response_text=e.response.text,
+            rollback_failed=rollback_failed,
+        )
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=error_detail(
+                code=status.HTTP_502_BAD_GATEWAY,
+                error=f"{message}Error from MoMa API (Status: {e.response.status_code}){rollback_note}",
+                details={
+                    "dataset_id": dataset_id,
+                    "moma_status_code": e.response.status_code,
+                    "moma_response": e.response.text,
+                    "rollback_failed": rollback_failed,
+                },
+            ),
+        )
+
+    if isinstance(e, httpx.RequestError):
+        logger.error(
+            "MoMa API request error during dataset load",
+            dataset_id=dataset_id,
+            error_type=type(e).__name__,
+            error=str(e),
+            timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
+            rollback_failed=rollback_failed,
+        )
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=error_detail(
+                code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                error=f"{message}Failed to connect to MoMa API{rollback_note}",
+                details={
+                    "dataset_id": dataset_id,
+                    "request_error_type": type(e).__name__,
+                    "request_error": str(e),
+                    "rollback_failed": rollback_failed,
+                },
+            ),
+        )
+
+    logger.error(
+        "Unexpected error during dataset load MoMa update",
+        dataset_id=dataset_id,
+        error_type=type(e).__name__,
+        error=str(e),
+        rollback_failed=rollback_failed,
+        exc_info=True,
+    )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=error_detail(
+            code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error=f"{message}{type(e).__name__}: {str(e)}{rollback_note}",
+        ),
+    )
+
+
 @router.put(
-    "/dataset/load", response_model=APSuccessEnvelope, response_model_exclude_none=True
+    "/dataset/load",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APSuccessEnvelope}},
 )
 async def load_dataset(
     wrapped: WrappedAPRequest,
     force: bool = Query(False),
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client),
 ):
     """Move dataset files from scratchpad to permanent storage and update Neo4j"""
     DATASET_DIR = os.getenv("DATASET_DIR")
@@ -906,19 +1588,16 @@ async def load_dataset(
         if not filtered_nodes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error="No Dataset node found in AP",
-                ).model_dump(exclude_none=True),
+                detail=_ERR_NO_DATASET_NODE,
             )
 
         if len(filtered_nodes) != 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
+                detail=error_detail(
                     code=status.HTTP_400_BAD_REQUEST,
                     error=f"Expected exactly 1 Dataset node, found {len(filtered_nodes)}",
-                ).model_dump(exclude_none=True),
+                ),
             )
 
         dataset_node = filtered_nodes[0]
@@ -941,10 +1620,10 @@ async def load_dataset(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Unexpected error during dataset extraction: {type(e).__name__}: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
     # Pre-check: Verify dataset exists in Neo4j with the provided status (fallback to 'staged')
@@ -956,9 +1635,13 @@ async def load_dataset(
             else DatasetState.Staged.value.lower()
         )
 
-        exists, _ = await get_dataset_metadata(
-            dataset_id, token=token, dataset_status=effective_status
+        existing_ids = await find_existing_datasets(
+            [dataset_id],
+            token=token,
+            client=client,
+            dataset_status=effective_status,
         )
+        exists = dataset_id in existing_ids
         logger.info(
             "Dataset existence check completed",
             dataset_id=dataset_id,
@@ -974,59 +1657,34 @@ async def load_dataset(
             )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=ErrorEnvelope(
+                detail=error_detail(
                     code=status.HTTP_404_NOT_FOUND,
                     error=msg,
-                ).model_dump(exclude_none=True),
+                ),
             )
     except HTTPException:
         raise
     except httpx.HTTPStatusError as e:
-        logger.error(
+        raise moma_http_error(
+            e,
             "MoMa API HTTP error while checking dataset existence during load",
+            "MoMa API error while verifying dataset existence",
             dataset_id=dataset_id,
-            status_code=e.response.status_code,
-            response_text=e.response.text,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=ErrorEnvelope(
-                code=status.HTTP_502_BAD_GATEWAY,
-                error="MoMa API error while verifying dataset existence",
-                details={
-                    "dataset_id": dataset_id,
-                    "moma_status_code": e.response.status_code,
-                    "moma_response": e.response.text,
-                },
-            ).model_dump(exclude_none=True),
         )
     except httpx.RequestError as e:
-        logger.error(
+        raise moma_request_error(
+            e,
             "MoMa API request error while checking dataset existence during load",
+            "Failed to connect to MoMa API while verifying dataset existence",
             dataset_id=dataset_id,
-            error_type=type(e).__name__,
-            error=str(e),
-            timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=ErrorEnvelope(
-                code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                error="Failed to connect to MoMa API while verifying dataset existence",
-                details={
-                    "dataset_id": dataset_id,
-                    "request_error_type": type(e).__name__,
-                    "request_error": str(e),
-                },
-            ).model_dump(exclude_none=True),
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Failed to verify dataset existence in Neo4j: {type(e).__name__}: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
     # Validate and move the dataset files
@@ -1040,231 +1698,142 @@ async def load_dataset(
         source_path = Path("/s3") / path_without_s3_prefix
         target_path = Path(DATASET_DIR) / dataset_id
 
-        if not source_path.exists():
-            raise FileNotFoundError(
-                f"Source dataset not found at expected location: {source_path}"
-            )
-        
-        if target_path.exists():
-            # If force is True and source and target resolve to the same path, skip the move
-            if force and source_path.resolve() == target_path.resolve():
-                pass
-            else:
-                raise FileExistsError(
-                    f"Target dataset with id {dataset_id} has already been moved to: {target_path}"
-                )
-        else:
-            shutil.move(str(source_path), str(target_path))
+        async with _dataset_moves:
+            await _move_dataset_files(source_path, target_path, dataset_id, force)
         new_path = f"s3://dataset/{dataset_id}"
 
     except FileNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_404_NOT_FOUND,
                 error=f"{str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
     except FileExistsError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_409_CONFLICT,
                 error=f"{str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_400_BAD_REQUEST,
                 error=f"Invalid input format: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Unexpected error during file move: {type(e).__name__}: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
     # Update the dataset metadata in Neo4j via PATCH /nodes/{id}
-    async with httpx.AsyncClient(
-        timeout=MOMA_REQUEST_TIMEOUT_SECONDS,
-        follow_redirects=True,
-    ) as client:
-        try:
-            logger.info(
-                "Updating dataset node in MoMa",
-                dataset_id=dataset_id,
-                new_archived_at=new_path,
-                new_status=DatasetState.Loaded.value,
-            )
-            response = await client.patch(
-                f"{MOMA_URL}nodes/{dataset_id}",
-                json={
+    try:
+        logger.info(
+            "Updating dataset node in MoMa",
+            dataset_id=dataset_id,
+            new_archived_at=new_path,
+            new_status=DatasetState.Loaded.value,
+        )
+        response = await client.patch(
+            f"{MOMA_URL}nodes/{dataset_id}",
+            content=dumps_json(
+                {
                     "archivedAt": new_path,
                     "status": DatasetState.Loaded.value,
-                },
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            response.raise_for_status()
-            logger.info(
-                "Dataset node updated in MoMa",
-                dataset_id=dataset_id,
-                status_code=response.status_code,
-            )
-
-            # # Update the ap_payload's dataset node with new values
-            # for node in filtered_nodes:
-            #     if node.get("id") == dataset_id:
-            #         node["properties"]["archivedAt"] = new_path
-            #         node["properties"]["status"] = DatasetState.Loaded.value
-            #         break
-
-        except HTTPException:
-            raise
-        except httpx.HTTPStatusError as e:
-            # Rollback: Move file back to original location
-            rollback_error = None
-            try:
-                if target_path.exists():
-                    shutil.move(str(target_path), str(source_path))
-            except Exception as rollback_exc:
-                rollback_error = rollback_exc
-
-            error_msg = f"Error from MoMa API (Status: {e.response.status_code})"
-            if rollback_error:
-                error_msg += f" [ROLLBACK FAILED: {type(rollback_error).__name__}: {str(rollback_error)}. File may be orphaned at {target_path}]"
-
-            logger.error(
-                "MoMa API HTTP error during dataset load",
-                dataset_id=dataset_id,
-                status_code=e.response.status_code,
-                response_text=e.response.text,
-                rollback_failed=rollback_error is not None,
-            )
-
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error=f"Dataset load failed during Neo4j update (file rolled back to {dataset_path}): {error_msg}",
-                    details={
-                        "dataset_id": dataset_id,
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                        "rollback_failed": rollback_error is not None,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            rollback_error = None
-            try:
-                if target_path.exists():
-                    shutil.move(str(target_path), str(source_path))
-            except Exception as rollback_exc:
-                rollback_error = rollback_exc
-
-            logger.error(
-                "MoMa API request error during dataset load",
-                dataset_id=dataset_id,
-                error_type=type(e).__name__,
-                error=str(e),
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-                rollback_failed=rollback_error is not None,
-            )
+                }
+            ),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+        )
+        response.raise_for_status()
+        logger.info(
+            "Dataset node updated in MoMa",
+            dataset_id=dataset_id,
+            status_code=response.status_code,
+        )
 
-            error_msg = "Failed to connect to MoMa API"
-            if rollback_error:
-                error_msg += f" [ROLLBACK FAILED: {type(rollback_error).__name__}: {str(rollback_error)}. File may be orphaned at {target_path}]"
+        # # Update the ap_payload's dataset node with new values
+        # for node in filtered_nodes:
+        #     if node.get("id") == dataset_id:
+        #         node["properties"]["archivedAt"] = new_path
+        #         node["properties"]["status"] = DatasetState.Loaded.value
+        #         break
 
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error=f"Dataset load failed during Neo4j update (file rolled back to {dataset_path}): {error_msg}",
-                    details={
-                        "dataset_id": dataset_id,
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                        "rollback_failed": rollback_error is not None,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except Exception as e:
-            # Rollback: Move file back to original location
-            rollback_error = None
-            try:
-                if target_path.exists():
-                    shutil.move(str(target_path), str(source_path))
-            except Exception as rollback_exc:
-                rollback_error = rollback_exc
-
-            error_msg = f"{type(e).__name__}: {str(e)}"
-            if rollback_error:
-                error_msg += f" [ROLLBACK FAILED: {type(rollback_error).__name__}: {str(rollback_error)}. File may be orphaned at {target_path}]"
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Rollback: Move file back to original location
+        rollback_error = None
+        try:
+            async with _dataset_moves:
+                await asyncio.to_thread(_rollback_dataset_move, source_path, target_path)
+        except Exception as rollback_exc:
+            rollback_error = rollback_exc
 
-            logger.error(
-                "Unexpected error during dataset load MoMa update",
-                dataset_id=dataset_id,
-                error_type=type(e).__name__,
-                error=str(e),
-                rollback_failed=rollback_error is not None,
-                exc_info=True,
-            )
+        raise _load_update_error(e, rollback_error, dataset_id, dataset_path, target_path)
 
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    error=f"Dataset load failed during Neo4j update (file rolled back to {dataset_path}): {error_msg}",
-                ).model_dump(exclude_none=True),
-            )
+    invalidate_dataset_caches([dataset_id])
 
     # Upload dataset to catalogue
     try:
-        ap_payload = update_dataset_archivedAt(ap_payload, dataset_id, new_path)
+        ap_payload, updated_node = update_dataset_archivedAt(
+            ap_payload, dataset_id, new_path
+        )
 
-        # Reconstruct dataset for catalogue
+        # Reuse the updated Dataset node for the catalogue entry
         dataset_for_catalogue = {
             "id": dataset_id,
+            **(updated_node.properties if updated_node else dataset_props),
             "archivedAt": new_path,
-            **dataset_props,
         }
 
-        json_dataset = json.dumps(dataset_for_catalogue, indent=2)
-        upload_dataset_to_catalogue(json_dataset, dataset_id)
+        await asyncio.to_thread(
+            upload_dataset_to_catalogue, dumps_json(dataset_for_catalogue), dataset_id
+        )
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Dataset updated in Neo4j but failed to upload to catalogue: {type(e).__name__}: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
-    return APSuccessEnvelope(
-        code=status.HTTP_200_OK,
-        message=f"Dataset moved from {dataset_path} to {new_path}",
-        ap=ap_payload.model_dump(by_alias=True, exclude_defaults=True),
+    return envelope_response(
+        {
+            "code": status.HTTP_200_OK,
+            "message": f"Dataset moved from {dataset_path} to {new_path}",
+            "ap": raw_json(
+                ap_payload.model_dump_json(by_alias=True, exclude_defaults=True)
+            ),
+        }
     )
 
 
 @router.put(
     "/dataset/update",
-    response_model=APSuccessEnvelope,
-    response_model_exclude_none=True,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APSuccessEnvelope}},
 )
 async def update_dataset(
     wrapped: WrappedAPRequest,
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client),
 ):
     """
     Update datasets in Neo4j by:
@@ -1285,10 +1854,7 @@ async def update_dataset(
         if not filtered_nodes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error="No Dataset/FileObject/RecordSet nodes found in AP",
-                ).model_dump(exclude_none=True),
+                detail=_ERR_NO_DATASET_OBJECTS,
             )
 
         # Get Dataset node IDs for existence check
@@ -1301,10 +1867,7 @@ async def update_dataset(
         if not dataset_ids:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error="No Dataset nodes found in AP",
-                ).model_dump(exclude_none=True),
+                detail=_ERR_NO_DATASET_NODES,
             )
 
         logger.info(
@@ -1319,621 +1882,433 @@ async def update_dataset(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Failed to parse AP: {type(e).__name__}: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
-    async with httpx.AsyncClient(
-        timeout=MOMA_REQUEST_TIMEOUT_SECONDS,
-        follow_redirects=True,
-    ) as client:
-        # Step 1: Check if each Dataset exists (lightweight search)
-        try:
-            for dataset_id in dataset_ids:
-                search_url = f"{MOMA_URL}datasets/"
-                search_params = {
-                    "nodeIds": dataset_id,
-                    "pageSize": 1,
-                    "properties": "id"
-                }
-                
-                response = await client.get(
-                    search_url,
-                    params=search_params,
-                    headers={"Authorization": f"Bearer {token}"}
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                datasets = data.get("datasets", [])
-                exists = len(datasets) > 0
-                
-                logger.info(
-                    "Verified dataset exists before update",
-                    dataset_id=dataset_id,
-                    exists=exists,
-                )
-                
-                if not exists:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=ErrorEnvelope(
-                            code=status.HTTP_404_NOT_FOUND,
-                            error=(
-                                f"Dataset with ID {dataset_id} not found in Neo4j. "
-                                "Please register it first using /dataset/register."
-                            ),
-                        ).model_dump(exclude_none=True),
-                    )
-                    
-        except HTTPException:
-            raise
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "MoMa API HTTP error while verifying dataset existence during update",
-                dataset_ids=dataset_ids,
-                status_code=e.response.status_code,
-                response_text=e.response.text,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error="MoMa API error while verifying dataset existence",
-                    details={
-                        "dataset_ids": dataset_ids,
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "MoMa API request error while verifying dataset existence during update",
-                dataset_ids=dataset_ids,
-                error_type=type(e).__name__,
-                error=str(e),
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error="Failed to connect to MoMa API while verifying dataset existence",
-                    details={
-                        "dataset_ids": dataset_ids,
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    error=f"Failed to verify dataset existence: {type(e).__name__}: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
-        
-        # Step 2: Ensure every node has a properties field (required by MoMa)
-        for node in filtered_nodes:
-            if "properties" not in node:
-                node["properties"] = {}
-
-        # Step 3: Inject 'ready' status if RecordSet is present
-        has_record_set = any(
-            "cr:RecordSet" in node.get("labels", []) for node in filtered_nodes
+    # Step 1: Check that every Dataset exists (single lightweight search)
+    try:
+        existing_ids = await find_existing_datasets(
+            dataset_ids, token=token, client=client
         )
-        
-        if has_record_set:
-            for node in filtered_nodes:
-                if "sc:Dataset" in node.get("labels", []):
-                    node.setdefault("properties", {})["status"] = DatasetState.Ready.value
 
-        # Step 4: Send everything to MoMa (upsert)
-        try:
+        for dataset_id in dataset_ids:
+            exists = dataset_id in existing_ids
+
             logger.info(
-                "Upserting datasets in MoMa",
-                dataset_ids=dataset_ids,
-                nodes_count=len(filtered_nodes),
-                edges_count=len(filtered_edges),
-            )
-            
-            response = await client.post(
-                f"{MOMA_URL}datasets/",
-                json={"nodes": filtered_nodes, "edges": filtered_edges},
-                headers={"Authorization": f"Bearer {token}"},
+                "Verified dataset exists before update",
+                dataset_id=dataset_id,
+                exists=exists,
             )
-            response.raise_for_status()
             
-            logger.info(
-                "Datasets upsert completed in MoMa",
-                status_code=response.status_code,
-                dataset_ids=dataset_ids,
-            )
-
-        except HTTPException:
-            raise
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "Failed to upsert dataset",
-                dataset_ids=dataset_ids,
-                status_code=e.response.status_code,
-                response_body=e.response.text,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_502_BAD_GATEWAY,
-                    error=f"Failed to upsert dataset: HTTP {e.response.status_code}",
-                    details={
-                        "dataset_ids": dataset_ids,
-                        "moma_status_code": e.response.status_code,
-                        "moma_response": e.response.text,
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "MoMa API request error during dataset update",
-                dataset_ids=dataset_ids,
-                error_type=type(e).__name__,
-                error=str(e),
-                timeout_seconds=MOMA_REQUEST_TIMEOUT_SECONDS,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    error="Failed to connect to MoMa API",
-                    details={
-                        "dataset_ids": dataset_ids,
-                        "request_error_type": type(e).__name__,
-                        "request_error": str(e),
-                    },
-                ).model_dump(exclude_none=True),
-            )
-        except Exception as e:
-            logger.error(
-                "Unexpected error during dataset update",
-                dataset_ids=dataset_ids,
-                error_type=type(e).__name__,
-                error=str(e),
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    error=f"Unexpected error during upsert: {type(e).__name__}: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
-
-    return APSuccessEnvelope(
-        code=status.HTTP_200_OK,
-        message="Dataset update completed",
-        ap=ap_payload.model_dump(by_alias=True, exclude_defaults=True),
-    )
-    
-
-@router.post(
-    "/cross-dataset-discovery/search", response_model=APResponseSuccessEnvelope
-)
-async def execute_and_store(
-    request: Request,
-    file: Optional[UploadFile] = File(None),
-    body: Optional[WrappedAPRequest] = Body(None),
-    token: str = Depends(security.oauth2_scheme),
-    token_payload: dict[str, Any] = Depends(security.require_app_scope),
-) -> APResponseSuccessEnvelope:
-    """Generic handler: forward AP to the appropriate service, store it, return full response.
-
-    Accepts AP in either format:
-    - Multipart form with file upload: file=@path/to/file.json
-    - JSON body: {"ap": {...}}
-    """
-    # Strip the API prefix to get the route path
-    route_path = request.url.path.replace("/api/v1", "", 1)
-    if route_path not in EXTERNAL_SERVICES:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ErrorEnvelope(
-                code=status.HTTP_404_NOT_FOUND,
-                error=f"Unknown endpoint: {route_path}",
-            ).model_dump(exclude_none=True),
+            if not exists:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=error_detail(
+                        code=status.HTTP_404_NOT_FOUND,
+                        error=(
+                            f"Dataset with ID {dataset_id} not found in Neo4j. "
+                            "Please register it first using /dataset/register."
+                        ),
+                    ),
+                )
+                
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        raise moma_http_error(
+            e,
+            "MoMa API HTTP error while verifying dataset existence during update",
+            "MoMa API error while verifying dataset existence",
+            dataset_ids=dataset_ids,
         )
-    service = EXTERNAL_SERVICES[route_path]
-
-    # Parse payload from either file or JSON body
-    payload_data = None
-
-    if file:
-        # Read and parse the uploaded JSON file
-        content = await file.read()
-        try:
-            payload_data = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error=f"Invalid JSON in uploaded file: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
-    elif body:
-        # Use JSON body directly (automatic FastAPI parsing)
-        payload_data = {"ap": body.ap.model_dump(exclude_none=True)}
-    else:
-        # Fallback: manually try to parse JSON body if automatic parsing didn't work
-        try:
-            body_content = await request.body()
-            if body_content:
-                payload_data = json.loads(body_content)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-    if not payload_data or "ap" not in payload_data:
+    except httpx.RequestError as e:
+        raise moma_request_error(
+            e,
+            "MoMa API request error while verifying dataset existence during update",
+            "Failed to connect to MoMa API while verifying dataset existence",
+            dataset_ids=dataset_ids,
+        )
+    except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="Request must include either a JSON file upload or JSON body with 'ap' field",
-            ).model_dump(exclude_none=True),
-        )
-    ap_obj = APRequest.model_validate(payload_data["ap"])
-    payload_data["ap"] = ap_obj.model_dump(by_alias=True, exclude_defaults=True)
-    async with httpx.AsyncClient(
-        timeout=REQUEST_TIMEOUT_SECONDS, follow_redirects=True
-    ) as client:
-        response = await client.post(
-            service["url"],
-            headers={"Authorization": f"Bearer {token}"},
-            json=payload_data,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error=f"Failed to verify dataset existence: {type(e).__name__}: {str(e)}",
+            ),
         )
+    
+    # Step 2: Ensure every node has a properties field (required by MoMa)
+    for node in filtered_nodes:
+        if "properties" not in node:
+            node["properties"] = {}
+
+    # Step 3: Inject 'ready' status if RecordSet is present
+    has_record_set = any(
+        "cr:RecordSet" in node.get("labels", []) for node in filtered_nodes
+    )
+    
+    if has_record_set:
+        for node in filtered_nodes:
+            if "sc:Dataset" in node.get("labels", []):
+                node.setdefault("properties", {})["status"] = DatasetState.Ready.value
 
+    # Step 4: Send everything to MoMa (upsert)
     try:
-        response_payload = response.json()
-        ap_obj = APRequest.model_validate(response_payload.get("ap", {}))
-        response_payload["ap"] = ap_obj.model_dump(by_alias=True, exclude_defaults=True)
-        ## AP storage in Grafeo
-        try: 
-            store_AP_in_grafeo(ap_obj)
-        except Exception as e:
-            logger.info(f"[{service['name']}] AP Storage failed: {e}")
-    except ValueError:
-        response_payload = {
-            "status_code": response.status_code,
-            "content": response.text,
-        }
-
-    # If response is not successful, raise an error with context-aware messages
-    if response.status_code >= 400:
-        logger.error(
-            f"Error from {service['name']}",
-            status_code=response.status_code,
-            response_text=response.text,
+        logger.info(
+            "Upserting datasets in MoMa",
+            dataset_ids=dataset_ids,
+            nodes_count=len(filtered_nodes),
+            edges_count=len(filtered_edges),
         )
-
-        # Extract error message and format it with service name and status code
-        if isinstance(response_payload, dict):
-            cdd_error_msg = response_payload.get("error", json.dumps(response_payload))
-        else:
-            cdd_error_msg = response.text
-
-        # Build context-specific error messages based on status code
-        status_messages = {
-            status.HTTP_401_UNAUTHORIZED: "Authentication failed. The token is invalid, expired, or missing.",
-            status.HTTP_403_FORBIDDEN: "Authorization failed. You lack the required role to perform this action.",
-            status.HTTP_424_FAILED_DEPENDENCY: "The service failed to communicate with a required dependency (OIDC provider, database, etc.).",
-            status.HTTP_500_INTERNAL_SERVER_ERROR: "An unexpected error occurred in the service while processing the request.",
-            status.HTTP_503_SERVICE_UNAVAILABLE: "The service is not ready. A core component may have failed during initialization.",
-        }
-
-        context_msg = status_messages.get(response.status_code, "")
-        error_message = (
-            f"{service['name']} returned error {response.status_code}: {cdd_error_msg}"
+        
+        response = await client.post(
+            f"{MOMA_URL}datasets/",
+            content=dumps_json({"nodes": filtered_nodes, "edges": filtered_edges}),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
         )
-        if context_msg:
-            error_message = f"{error_message} — {context_msg}"
-
-        raise HTTPException(
+        response.raise_for_status()
+        
+        logger.info(
+            "Datasets upsert completed in MoMa",
             status_code=response.status_code,
-            detail=ErrorEnvelope(
-                code=response.status_code,
-                error=error_message,
-            ).model_dump(exclude_none=True),
-        )
-
-    return APResponseSuccessEnvelope(
-        code=response.status_code,
-        message=f"{service['name']} completed successfully",
-        content=response_payload,
-    )
-
-@router.post(
-    "/query-disambiguation", response_model=APResponseSuccessEnvelope
-)
-async def execute_and_store(
-    request: Request,
-    file: Optional[UploadFile] = File(None),
-    body: Optional[WrappedAPRequest] = Body(None),
-    token: str = Depends(security.oauth2_scheme),
-    token_payload: dict[str, Any] = Depends(security.require_app_scope),
-) -> APResponseSuccessEnvelope:
-    """Generic handler: forward AP to the appropriate service, store it, return full response.
-    Accepts AP in either format:
-    - Multipart form with file upload: file=@path/to/file.json
-    - JSON body: {"ap": {...}}
-    """
-    # Strip the API prefix to get the route path
-    route_path = request.url.path.replace("/api/v1", "", 1)
-    if route_path not in EXTERNAL_SERVICES:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ErrorEnvelope(
-                code=status.HTTP_404_NOT_FOUND,
-                error=f"Unknown endpoint: {route_path}",
-            ).model_dump(exclude_none=True),
+            dataset_ids=dataset_ids,
         )
-    service = EXTERNAL_SERVICES[route_path]
-
-    # Parse payload from either file or JSON body
-    payload_data = None
-
-    if file:
-        # Read and parse the uploaded JSON file
-        content = await file.read()
-        try:
-            payload_data = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error=f"Invalid JSON in uploaded file: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
-    elif body:
-        # Use JSON body directly (automatic FastAPI parsing)
-        payload_data = {"ap": body.ap.model_dump(exclude_none=True)}
-    else:
-        # Fallback: manually try to parse JSON body if automatic parsing didn't work
-        try:
-            body_content = await request.body()
-            if body_content:
-                payload_data = json.loads(body_content)
-        except (json.JSONDecodeError, ValueError):
-            pass
 
-    if not payload_data or "ap" not in payload_data:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="Request must include either a JSON file upload or JSON body with 'ap' field",
-            ).model_dump(exclude_none=True),
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        raise moma_http_error(
+            e,
+            "Failed to upsert dataset",
+            f"Failed to upsert dataset: HTTP {e.response.status_code}",
+            dataset_ids=dataset_ids,
         )
-    ap_obj = APRequest.model_validate(payload_data["ap"])
-    
-    payload_data["ap"] = ap_obj.model_dump(by_alias=True, exclude_defaults=True)
-    async with httpx.AsyncClient(
-        timeout=REQUEST_TIMEOUT_SECONDS, follow_redirects=True
-    ) as client:
-        response = await client.post(
-            service["url"],
-            headers={"Authorization": f"Bearer {token}"},
-            json=payload_data,
+    except httpx.RequestError as e:
+        raise moma_request_error(
+            e, "MoMa API request error during dataset update", dataset_ids=dataset_ids
         )
-
-    try:
-        response_payload = response.json()
-        ap_obj = APRequest.model_validate(response_payload.get("ap", {}))
-        response_payload["ap"] = ap_obj.model_dump(by_alias=True, exclude_defaults=True)
-        ## AP storage in Grafeo
-        try: 
-            store_AP_in_grafeo(ap_obj)
-        except Exception as e:
-            logger.info(f"[{service['name']}] AP Storage failed: {e}")
-    except ValueError:
-        response_payload = {
-            "status_code": response.status_code,
-            "content": response.text,
-        }
-
-    # If response is not successful, raise an error with context-aware messages
-    if response.status_code >= 400:
+    except Exception as e:
         logger.error(
-            f"Error from {service['name']}",
-            status_code=response.status_code,
-            response_text=response.text,
-        )
-
-        # Extract error message and format it with service name and status code
-        if isinstance(response_payload, dict):
-            error_msg = response_payload.get("error", json.dumps(response_payload))
-        else:
-            error_msg = response.text
-
-        # Build context-specific error messages based on status code
-        status_messages = {
-            status.HTTP_401_UNAUTHORIZED: "Authentication failed. The token is invalid, expired, or missing.",
-            status.HTTP_403_FORBIDDEN: "Authorization failed. You lack the required role to perform this action.",
-            status.HTTP_424_FAILED_DEPENDENCY: "The service failed to communicate with a required dependency (OIDC provider, database, etc.).",
-            status.HTTP_500_INTERNAL_SERVER_ERROR: "An unexpected error occurred in the service while processing the request.",
-            status.HTTP_503_SERVICE_UNAVAILABLE: "The service is not ready. A core component may have failed during initialization.",
-        }
-
-        context_msg = status_messages.get(response.status_code, "")
-        error_message = (
-            f"{service['name']} returned error {response.status_code}: {error_msg}"
+            "Unexpected error during dataset update",
+            dataset_ids=dataset_ids,
+            error_type=type(e).__name__,
+            error=str(e),
+            exc_info=True,
         )
-        if context_msg:
-            error_message = f"{error_message} — {context_msg}"
-
         raise HTTPException(
-            status_code=response.status_code,
-            detail=ErrorEnvelope(
-                code=response.status_code,
-                error=error_message,
-            ).model_dump(exclude_none=True),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error=f"Unexpected error during upsert: {type(e).__name__}: {str(e)}",
+            ),
         )
 
-    return APResponseSuccessEnvelope(
-        code=response.status_code,
-        message=f"{service['name']} completed successfully",
-        content=response_payload,
+    invalidate_dataset_caches(dataset_ids)
+    return envelope_response(
+        {
+            "code": status.HTTP_200_OK,
+            "message": "Dataset update completed",
+            "ap": raw_json(
+                ap_payload.model_dump_json(by_alias=True, exclude_defaults=True)
+            ),
+        }
     )
     
-    
 
-@router.post(
-    "/dataset-recsys/recommend", response_model=APResponseSuccessEnvelope
-)
-async def execute_and_store_dataset_recommendations(
-    request: Request,
-    file: Optional[UploadFile] = File(None),
-    body: Optional[WrappedAPRequest] = Body(None),
-    token: str = Depends(security.oauth2_scheme),
-    token_payload: dict[str, Any] = Depends(security.require_app_scope),
-) -> APResponseSuccessEnvelope:
-    """Generic handler: forward AP to the appropriate service, store it, return full response.
+# Context added to the error message when a downstream service fails
+_SERVICE_ERROR_CONTEXT = {
+    status.HTTP_401_UNAUTHORIZED: "Authentication failed. The token is invalid, expired, or missing.",
+    status.HTTP_403_FORBIDDEN: "Authorization failed. You lack the required role to perform this action.",
+    status.HTTP_424_FAILED_DEPENDENCY: "The service failed to communicate with a required dependency (OIDC provider, database, etc.).",
+    status.HTTP_500_INTERNAL_SERVER_ERROR: "An unexpected error occurred in the service while processing the request.",
+    status.HTTP_503_SERVICE_UNAVAILABLE: "The service is not ready. A core component may have failed during initialization.",
+}
+
 
-    Accepts AP in either format:
-    - Multipart form with file upload: file=@path/to/file.json
-    - JSON body: {"ap": {...}}
-    """
+def resolve_external_service(request: Request) -> Dict[str, str]:
+    """Return the EXTERNAL_SERVICES entry for the route being called"""
     # Strip the API prefix to get the route path
     route_path = request.url.path.replace("/api/v1", "", 1)
     if route_path not in EXTERNAL_SERVICES:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_404_NOT_FOUND,
                 error=f"Unknown endpoint: {route_path}",
-            ).model_dump(exclude_none=True),
+            ),
         )
-    service = EXTERNAL_SERVICES[route_path]
+    return EXTERNAL_SERVICES[route_path]
 
-    # Parse payload from either file or JSON body
-    payload_data = None
 
+async def read_uploaded_or_raw_json(
+    request: Request, file: Optional[UploadFile]
+) -> Any:
+    """Parse the payload from an uploaded JSON file, or else from the raw request body"""
     if file:
         # Read and parse the uploaded JSON file
         content = await file.read()
         try:
-            payload_data = json.loads(content)
+            return loads_json(content)
         except json.JSONDecodeError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
+                detail=error_detail(
                     code=status.HTTP_400_BAD_REQUEST,
                     error=f"Invalid JSON in uploaded file: {str(e)}",
-                ).model_dump(exclude_none=True),
+                ),
             )
-    elif body:
+
+    # Fallback: manually try to parse JSON body if automatic parsing didn't work
+    try:
+        body_content = await request.body()
+        if body_content:
+            return loads_json(body_content)
+    except (json.JSONDecodeError, ValueError):
+        pass
+    return None
+
+
+def raise_for_service_error(
+    service: Dict[str, str], response: httpx.Response, response_payload: Any
+) -> None:
+    """Raise an HTTPException with a context-aware message if the service call failed"""
+    if response.status_code < 400:
+        return
+
+    logger.error(
+        f"Error from {service['name']}",
+        status_code=response.status_code,
+        response_text=response.text,
+    )
+
+    # Extract error message and format it with service name and status code
+    if isinstance(response_payload, dict):
+        error_msg = response_payload.get("error", json.dumps(response_payload))
+    else:
+        error_msg = response.text
+
+    context_msg = _SERVICE_ERROR_CONTEXT.get(response.status_code, "")
+    error_message = (
+        f"{service['name']} returned error {response.status_code}: {error_msg}"
+    )
+    if context_msg:
+        error_message = f"{error_message} — {context_msg}"
+
+    raise HTTPException(
+        status_code=response.status_code,
+        detail=error_detail(
+            code=response.status_code,
+            error=error_message,
+        ),
+    )
+
+
+async def forward_ap_to_service(
+    request: Request,
+    client: httpx.AsyncClient,
+    file: Optional[UploadFile],
+    body: Optional[WrappedAPRequest],
+    token: str,
+    normalize_ap: bool = True,
+) -> Response:
+    """Forward an AP to the service behind the current route, store the AP it returns
+    in Grafeo and wrap the service response.
+
+    Args:
+        normalize_ap: Re-serialize the AP sent to and returned by the service through
+            APRequest, so both use the canonical aliases and omit defaults.
+    """
+    service = resolve_external_service(request)
+
+    # Parse payload from either file or JSON body
+    if body and not file:
         # Use JSON body directly (automatic FastAPI parsing)
         payload_data = {"ap": body.ap.model_dump(exclude_none=True)}
     else:
-        # Fallback: manually try to parse JSON body if automatic parsing didn't work
-        try:
-            body_content = await request.body()
-            if body_content:
-                payload_data = json.loads(body_content)
-        except (json.JSONDecodeError, ValueError):
-            pass
+        payload_data = await read_uploaded_or_raw_json(request, file)
 
     if not payload_data or "ap" not in payload_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="Request must include either a JSON file upload or JSON body with 'ap' field",
-            ).model_dump(exclude_none=True),
+            detail=_ERR_MISSING_AP,
         )
-    
-    async with httpx.AsyncClient(
-        timeout=REQUEST_TIMEOUT_SECONDS, follow_redirects=True
-    ) as client:
-        response = await client.post(
-            service["url"],
-            headers={"Authorization": f"Bearer {token}"},
-            json=payload_data,
+    if normalize_ap:
+        ap_obj = APRequest.model_validate(payload_data["ap"])
+        # Serialized by pydantic-core and embedded as-is in the request body
+        payload_data["ap"] = raw_json(
+            ap_obj.model_dump_json(by_alias=True, exclude_defaults=True)
         )
 
+    response = await client.post(
+        service["url"],
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        },
+        content=dumps_json(payload_data),
+    )
+
     try:
-        response_payload = response.json()
+        response_payload = loads_json(response.content)
+        if normalize_ap:
+            ap_obj = APRequest.model_validate(response_payload.get("ap", {}))
+            response_payload["ap"] = ap_obj.model_dump(by_alias=True, exclude_defaults=True)
         ## AP storage in Grafeo
-        try: 
-            store_AP_in_grafeo(APRequest.model_validate(response_payload.get("ap", {})))
+        try:
+            if not normalize_ap:
+                ap_obj = APRequest.model_validate(response_payload.get("ap", {}))
+            await asyncio.to_thread(store_AP_in_grafeo, ap_obj)
         except Exception as e:
-            print(f"[{service['name']}] AP Storage failed: {e}")
+            logger.info(f"[{service['name']}] AP Storage failed: {e}")
     except ValueError:
         response_payload = {
             "status_code": response.status_code,
             "content": response.text,
         }
 
-    # If response is not successful, raise an error with context-aware messages
-    if response.status_code >= 400:
-        logger.error(
-            f"Error from {service['name']}",
-            status_code=response.status_code,
-            response_text=response.text,
-        )
+    raise_for_service_error(service, response, response_payload)
 
-        # Extract error message and format it with service name and status code
-        if isinstance(response_payload, dict):
-            cdd_error_msg = response_payload.get("error", json.dumps(response_payload))
-        else:
-            cdd_error_msg = response.text
-
-        # Build context-specific error messages based on status code
-        status_messages = {
-            status.HTTP_401_UNAUTHORIZED: "Authentication failed. The token is invalid, expired, or missing.",
-            status.HTTP_403_FORBIDDEN: "Authorization failed. You lack the required role to perform this action.",
-            status.HTTP_424_FAILED_DEPENDENCY: "The service failed to communicate with a required dependency (OIDC provider, database, etc.).",
-            status.HTTP_500_INTERNAL_SERVER_ERROR: "An unexpected error occurred in the service while processing the request.",
-            status.HTTP_503_SERVICE_UNAVAILABLE: "The service is not ready. A core component may have failed during initialization.",
+    # The service's JSON is forwarded as-is, without re-validating it
+    return envelope_response(
+        {
+            "code": response.status_code,
+            "message": f"{service['name']} completed successfully",
+            "content": response_payload,
         }
+    )
 
-        context_msg = status_messages.get(response.status_code, "")
-        error_message = (
-            f"{service['name']} returned error {response.status_code}: {cdd_error_msg}"
-        )
-        if context_msg:
-            error_message = f"{error_message} — {context_msg}"
 
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=ErrorEnvelope(
-                code=response.status_code,
-                error=error_message,
-            ).model_dump(exclude_none=True),
-        )
+@router.post(
+    "/cross-dataset-discovery/search",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
+async def execute_and_store(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    body: Optional[WrappedAPRequest] = Body(None),
+    token: str = Depends(security.oauth2_scheme),
+    token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_service_client),
+) -> Response:
+    """Generic handler: forward AP to the appropriate service, store it, return full response.
+
+    Accepts AP in either format:
+    - Multipart form with file upload: file=@path/to/file.json
+    - JSON body: {"ap": {...}}
+    """
+    return await forward_ap_to_service(request, client, file, body, token)
+
+
+@router.post(
+    "/query-disambiguation",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
+async def execute_and_store(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    body: Optional[WrappedAPRequest] = Body(None),
+    token: str = Depends(security.oauth2_scheme),
+    token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_service_client),
+) -> Response:
+    """Generic handler: forward AP to the appropriate service, store it, return full response.
+    Accepts AP in either format:
+    - Multipart form with file upload: file=@path/to/file.json
+    - JSON body: {"ap": {...}}
+    """
+    return await forward_ap_to_service(request, client, file, body, token)
+
+
+@router.post(
+    "/dataset-recsys/recommend",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
+async def execute_and_store_dataset_recommendations(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    body: Optional[WrappedAPRequest] = Body(None),
+    token: str = Depends(security.oauth2_scheme),
+    token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_service_client),
+) -> Response:
+    """Generic handler: forward AP to the appropriate service, store it, return full response.
 
-    return APResponseSuccessEnvelope(
-        code=response.status_code,
-        message=f"{service['name']} completed successfully",
-        content=response_payload,
+    Accepts AP in either format:
+    - Multipart form with file upload: file=@path/to/file.json
+    - JSON body: {"ap": {...}}
+    """
+    # The recommender's AP is forwarded and returned as-is
+    return await forward_ap_to_service(
+        request, client, file, body, token, normalize_ap=False
     )
 
 
+# Process-wide in-memory DuckDB database. Each query runs on its own cursor, so
+# temporary views stay private to the request while the loaded postgres
+# extension and the attached PostgreSQL databases are reused between queries.
+_duckdb_database: Optional[duckdb.DuckDBPyConnection] = None
+_duckdb_postgres_loaded = False
+_duckdb_lock = threading.Lock()
+# Concurrent executions of the same query over the same sources share one DuckDB run
+_query_executions = SingleFlight()
+# Result CSV paths of recently executed queries, keyed by the token subject, the
+# ETag of the query builder (query, software and resolved sources) and the stat
+# of the source files, so a
+# resubmitted AP copies the earlier output instead of running DuckDB again.
+# Only the path is kept, so an entry stays small whatever the result size.
+_query_results = TTLCache(
+    maxsize=QUERY_RESULT_CACHE_MAX_ENTRIES, ttl_seconds=QUERY_RESULT_CACHE_TTL_SECONDS
+)
+
+
+def get_duckdb_cursor() -> duckdb.DuckDBPyConnection:
+    """Return a new cursor on the shared DuckDB database, creating it on first use"""
+    global _duckdb_database
+    with _duckdb_lock:
+        if _duckdb_database is None:
+            _duckdb_database = duckdb.connect(database=":memory:")
+        return _duckdb_database.cursor()
+
+
+def attach_postgres_database(con, db_name: str, connection_string: str) -> None:
+    """Attach a PostgreSQL database to the shared DuckDB database unless already attached"""
+    global _duckdb_postgres_loaded
+    with _duckdb_lock:
+        if not _duckdb_postgres_loaded:
+            # Install and load postgres extension
+            con.sql("INSTALL postgres;")
+            con.sql("LOAD postgres;")
+            _duckdb_postgres_loaded = True
+        # Quoted, so any legal PostgreSQL database name (e.g. "my-db") is a valid alias
+        alias = db_name.replace('"', '""')
+        connection_string = connection_string.replace("'", "''")
+        con.sql(
+            f"ATTACH IF NOT EXISTS '{connection_string}' AS \"{alias}\" (TYPE postgres);"
+        )
+
+
 def execute_query_postgres(query_builder):
     """Execute query on PostgreSQL via DuckDB"""
-    duckdb_connection = duckdb.connect(database=":memory:")
+    duckdb_connection = get_duckdb_cursor()
     t0 = time.perf_counter()
     try:
-        # Install and load postgres extension
-        duckdb_connection.sql("INSTALL postgres;")
-        duckdb_connection.sql("LOAD postgres;")
-
         db_name = None
         for argname, arg_info in query_builder.get("args_map", {}).items():
             if arg_info.get("mimeType") == "text/sql":
-                db_name = arg_info.get("dbConnection", {}).get("name", "Unknown DB")
+                db_conn_props = arg_info.get("dbConnection") or {}
+                db_name = (
+                    db_conn_props.get("name")
+                    or arg_info.get("contentUrl", "").split(".")[0]
+                )
 
         # Attach PostgreSQL database
         db_host = os.getenv("DATAGEMS_POSTGRES_HOST")
@@ -1967,12 +2342,12 @@ def execute_query_postgres(query_builder):
 
         query = query_builder.get("query", "")
         query = query_rewriting(query_builder)
-        duckdb_connection.sql(f"ATTACH '{connection_string}' AS pg_db (TYPE postgres);")
+        attach_postgres_database(duckdb_connection, db_name, connection_string)
         t1 = time.perf_counter()
         try: 
             result_df = duckdb_connection.execute(
-                "SELECT * FROM postgres_query('pg_db', ?)",
-                [query]
+                "SELECT * FROM postgres_query(?, ?)",
+                [db_name, query]
             ).fetchdf()  
         finally:
             duckdb_connection.close()      
@@ -1999,7 +2374,7 @@ def execute_query_mixed(query_builder):
         )
     
     try:
-        con = duckdb.connect(database=":memory:")
+        con = get_duckdb_cursor()
         db_connections = []
         view_map = {}
         for argname, arg_info in query_builder.get("args_map", {}).items():
@@ -2026,11 +2401,6 @@ def execute_query_mixed(query_builder):
         args_map, query_executable = write_views_minimal_extraction(processed_query, args_map)
 
         if db_connections:
-            con.sql("INSTALL postgres;")
-            con.sql("LOAD postgres;")
-            con.sql("SET pg_experimental_filter_pushdown = true;")
-            con.sql("SET pg_use_binary_copy = true;")
-            con.sql("SET pg_use_ctid_scan = true;")
             db_host = os.getenv("DATAGEMS_POSTGRES_HOST")
             db_port = os.getenv("DATAGEMS_POSTGRES_PORT")
             db_user = os.getenv("DS_READER_USER")
@@ -2055,7 +2425,10 @@ def execute_query_mixed(query_builder):
                     f"dbname={db_name} user={db_user} password={db_password} "
                     f"host={db_host} port={db_port}"
                 )
-                con.sql(f"ATTACH '{connection_string}' AS {db_name} (TYPE postgres);")
+                attach_postgres_database(con, db_name, connection_string)
+            con.sql("SET pg_experimental_filter_pushdown = true;")
+            con.sql("SET pg_use_binary_copy = true;")
+            con.sql("SET pg_use_ctid_scan = true;")
 
         for argname, arg_info in query_builder.get("args_map", {}).items():
             view  = arg_info.get("view")
@@ -2127,7 +2500,20 @@ def query_rewriting(
     return rewritten_query
 
 
-async def extract_query_from_AP(ap_payload, token
+# Categories of AP nodes, in the order a node carrying several of these labels is
+# classified under the first one
+_AP_NODE_CATEGORIES = (
+    "Analytical_Pattern",
+    "SQL_Operator",
+    "sc:Dataset",
+    "User",
+    "cr:FileObject",
+    "dg:DatabaseConnection",
+)
+
+
+async def extract_query_from_AP(
+    ap_payload, token, client: Optional[httpx.AsyncClient] = None
 ) -> Dict[str, Any]:
     """
     The query builder returns a dictionary containing:
@@ -2151,7 +2537,7 @@ async def extract_query_from_AP(ap_payload, token
         if isinstance(ap_payload, APRequest):
             request = ap_payload
         else:
-            data = json.loads(ap_payload)
+            data = loads_json(ap_payload)
             ap_data = data.get("ap", data)
             request = APRequest(**ap_data)
         G = json_to_graph(request)
@@ -2161,41 +2547,64 @@ async def extract_query_from_AP(ap_payload, token
             detail=f"Failed to parse the Analytical Pattern: {str(e)}",
         )
 
-    AP_nodes, operator_nodes, dataset_nodes, file_object_nodes, user_nodes, db_connection_nodes = [], [], [], [], [], []
-
     ## CHECKS about the AP 
+    # Index the node IDs by category in one pass
+    nodes_by_category: Dict[str, List[Any]] = {c: [] for c in _AP_NODE_CATEGORIES}
     for node_id, attributes in G.nodes(data=True):
         labels = attributes.get("labels", [])
-        if "Analytical_Pattern" in labels:
-            AP_nodes.append(node_id)
-        elif "SQL_Operator" in labels:
-            operator_nodes.append(node_id)
-        elif "sc:Dataset" in labels:
-            dataset_nodes.append(node_id)
-        elif "User" in labels:
-            user_nodes.append(node_id)
-        elif "cr:FileObject" in labels:
-            file_object_nodes.append(node_id)
-        elif "dg:DatabaseConnection" in labels:
-            db_connection_nodes.append(node_id)
+        for category in _AP_NODE_CATEGORIES:
+            if category in labels:
+                nodes_by_category[category].append(node_id)
+                break
+    operator_nodes = nodes_by_category["SQL_Operator"]
+    db_connection_nodes = nodes_by_category["dg:DatabaseConnection"]
 
-    ## Get the query 
+    operator_properties = G.nodes[operator_nodes[0]].get("properties", {})
     query_builder = {}
-    query_builder["query"] = G.nodes[operator_nodes[0]].get("properties", {}).get("query", "")
+    ## Get the query 
+    query_builder["query"] = operator_properties.get("query", "")
 
     ## Get the software 
-    query_builder["software"] = G.nodes[operator_nodes[0]].get("properties", {}).get("name", "Unknown Software")
+    query_builder["software"] = operator_properties.get("name", "Unknown Software")
 
     ## Get the arg_map 
-    args_map = {
-        data.get("properties", {}).get("argname"): u
-        for u, v, data in G.edges(data=True)
-        if "argname" in data.get("properties", {})
-    }
+    args_map = {}
+    for u, _, data in G.edges(data=True):
+        edge_properties = data.get("properties", {})
+        if "argname" in edge_properties:
+            args_map[edge_properties["argname"]] = u
+    db_connection_map = {}
+    for argname, node_id in args_map.items():
+        for u, v, data in G.edges(node_id, data=True):
+            if "contained_in" in data.get("labels", []):
+                db_connection_map[argname] = v
+
+    # Fetch every FileObject and database connection node from MoMa concurrently,
+    # once per distinct node, over a single client
+    node_ids = list(dict.fromkeys([*args_map.values(), *db_connection_map.values()]))
+    should_close = client is None
+    if client is None:
+        client = create_moma_client()
+    try:
+        node_properties = dict(
+            zip(
+                node_ids,
+                await asyncio.gather(
+                    *(
+                        get_node_properties(node_id, token=token, client=client)
+                        for node_id in node_ids
+                    )
+                ),
+            )
+        )
+    finally:
+        if should_close:
+            await client.aclose()
+
     mimeTypes = set()
     for argname in args_map.keys():
         node_id = args_map[argname]
-        file_object_properties = await get_node_properties(node_id, token=token)
+        file_object_properties = node_properties[node_id]
         mimeType = file_object_properties.get("encodingFormat", "")
         args_map[argname] = {
             "mimeType" : mimeType,
@@ -2203,12 +2612,10 @@ async def extract_query_from_AP(ap_payload, token
             "name" : file_object_properties.get("name", "")
         }
         mimeTypes.add(mimeType)
-        db_connection_properties = None
-        for u, v, data in G.edges(node_id, data=True):
-            if "contained_in" in data.get("labels", []):
-                db_connection_node_id = v
-                db_connection_properties = await get_node_properties(db_connection_node_id, token=token)
-        args_map[argname]["dbConnection"] = db_connection_properties
+        db_connection_node_id = db_connection_map.get(argname)
+        args_map[argname]["dbConnection"] = (
+            node_properties[db_connection_node_id] if db_connection_node_id else None
+        )
     query_builder["args_map"] = args_map
     if db_connection_nodes and len(db_connection_nodes) == 1:
         if any(m != "text/sql" for m in mimeTypes):
@@ -2226,20 +2633,26 @@ def execute_query_xml(csv_name, query, software, xml_path):
 
 
 # Get the properties of a node from MoMa given its ID. This is needed to get the contentUrl of the datasets, which is required to execute the query
-async def get_node_properties(node_id, token: Optional[str] = None) -> Dict[str, Any]:
-    """Fetch node properties from MoMa2 API"""
+async def get_node_properties(
+    node_id, token: Optional[str] = None, client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
+    """Fetch node properties from MoMa2 API, reusing `client` if given"""
     moma_api_url = os.getenv(
         "MOMA_API_URL", "https://datagems-dev.scayle.es/moma2/v1/api"
     )
     endpoint = f"{moma_api_url}/nodes/{node_id}"
+    should_close = client is None
+    if client is None:
+        client = create_moma_client()
     try:
-        async with httpx.AsyncClient(
-            timeout=MOMA_REQUEST_TIMEOUT_SECONDS, follow_redirects=True
-        ) as client:
+        try:
             response = await client.get(
                 endpoint,
                 headers={"Authorization": f"Bearer {token if token else 'NO_TOKEN'}"},
             )
+        finally:
+            if should_close:
+                await client.aclose()
 
         # Check if node was not found
         if response.status_code == 404:
@@ -2259,7 +2672,7 @@ async def get_node_properties(node_id, token: Optional[str] = None) -> Dict[str,
             )
 
         try:
-            response_payload = response.json()
+            response_payload = loads_json(response.content)
         except ValueError:
             response_payload = {
                 "status_code": response.status_code,
@@ -2290,26 +2703,33 @@ async def get_node_properties(node_id, token: Optional[str] = None) -> Dict[str,
 
 @router.post(
     "/polyglot/query",
-    response_model=APSuccessEnvelope,
-    response_model_exclude_none=True,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APSuccessEnvelope}},
 )
 async def polyglot_query(
     wrapped: WrappedAPRequest,
     token: str = Depends(security.oauth2_scheme),
-    token_payload: dict[str, Any] = Depends(security.require_app_scope)
+    token_payload: dict[str, Any] = Depends(security.require_app_scope),
+    client: httpx.AsyncClient = Depends(get_moma_client),
 ):
     """Execute a SQL query on a dataset based on an Analytical Pattern"""
     try:
         
-        executed_ap, upload_path = await execute_query(wrapped, token=token)
+        executed_ap, upload_path = await execute_query(
+            wrapped, token=token, token_payload=token_payload, client=client
+        )
         try: 
-            store_AP_in_grafeo(executed_ap)
+            await asyncio.to_thread(store_AP_in_grafeo, executed_ap)
         except Exception as e:
             print(f"AP Storage failed: {e}")
-        return APSuccessEnvelope(
-            code=status.HTTP_200_OK,
-            message=f"Query executed successfully, results stored at {upload_path}",
-            ap=executed_ap.model_dump(by_alias=True, exclude_defaults=True),
+        return envelope_response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": f"Query executed successfully, results stored at {upload_path}",
+                "ap": raw_json(
+                    executed_ap.model_dump_json(by_alias=True, exclude_defaults=True)
+                ),
+            }
         )
 
     except HTTPException:
@@ -2326,16 +2746,21 @@ async def polyglot_query(
         )
 
 
-async def execute_query(wrapped: WrappedAPRequest, token: str):
+async def execute_query(
+    wrapped: WrappedAPRequest,
+    token: str,
+    token_payload: dict[str, Any],
+    client: Optional[httpx.AsyncClient] = None,
+):
     from ..resources.dataset import register_dataset
 
     ap_payload = wrapped.ap
-    query_builder = await extract_query_from_AP(ap_payload, token=token)
+    query_builder = await extract_query_from_AP(ap_payload, token=token, client=client)
     if query_builder["software"].split(" ")[0].lower() == "duckdb":
         if query_builder["type"] == "postgres":
-            result = execute_query_postgres(query_builder)
+            run_query = execute_query_postgres
         elif query_builder["type"] == "mixed":
-            result = execute_query_mixed(query_builder)
+            run_query = execute_query_mixed
         elif query_builder["type"] == "unknown":
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -2351,25 +2776,62 @@ async def execute_query(wrapped: WrappedAPRequest, token: str):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Unsupported software '{query_builder['software']}'. Only DuckDB-based operators are supported.",
         )
-    
-        
+
+    # PostgreSQL tables can change at any time, so only results computed over
+    # files alone are reused
+    cacheable = all(
+        arg_info.get("mimeType") != "text/sql"
+        for arg_info in query_builder.get("args_map", {}).values()
+    )
+    # The key is taken before running, as execute_query_mixed annotates the
+    # args_map in place
+    query_key = (token_payload.get("sub"), json_etag(query_builder))
+    cached_csv = None
+    if cacheable:
+        query_key += (await asyncio.to_thread(_csv_source_stats, query_builder),)
+        cached_csv = _query_results.get(query_key)
+
     ap_payload, dataset_id = generate_dataset_node(ap_payload)
-    t2 = time.perf_counter()
-    csv_bytes = result.to_csv(index=False).encode("utf-8")
-    upload_path, dataset_id = upload_csv_to_results(csv_bytes, dataset_id)
-    logger.info(f"[TIMER] Results printed in s3: {time.perf_counter() - t2:.4f}s")    
+    # The results folder only depends on the dataset ID, so the AP can be built
+    # before the CSV is written
+    upload_path = get_results_folder(dataset_id)
     AP_query_after = update_AP_after_query(ap_payload, dataset_id, upload_path)
     logger.info(f"AP updated with new dataset ID and properties after query execution. Dataset ID: {dataset_id}")
-    t3 = time.perf_counter()
-    upload_ap_to_results(
-        json.dumps(
-            AP_query_after.model_dump(by_alias=True, exclude_defaults=True),
-            ensure_ascii=False,
-            indent=2,
-        ),
-        dataset_id,
-    )
-    logger.info(f"[TIMER] AP uploaded: {time.perf_counter() - t3:.4f}s")
+
+    t2 = time.perf_counter()
+    # The AP points at the result CSV, so it is only written once the CSV is;
+    # if either write fails the partial outputs are removed
+    try:
+        if cached_csv is not None and await asyncio.to_thread(
+            copy_results_csv, cached_csv, dataset_id
+        ):
+            logger.info("Query result served from cache")
+        else:
+            # DuckDB releases the GIL while executing, so queries run in worker
+            # threads and the event loop keeps serving other requests meanwhile
+            result = await _query_executions.do(
+                query_key,
+                lambda: asyncio.to_thread(run_query, query_builder),
+            )
+            await asyncio.to_thread(upload_dataframe_to_results, result, dataset_id)
+            if cacheable:
+                _query_results.set(query_key, str(Path(upload_path) / "output.csv"))
+        await asyncio.to_thread(
+            upload_ap_to_results,
+            dumps_json(AP_query_after.model_dump(by_alias=True, exclude_defaults=True)),
+            dataset_id,
+        )
+    except RuntimeError as e:
+        await asyncio.to_thread(remove_results, dataset_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error="Failed to store query results",
+                details={"message": str(e)},
+            ),
+        )
+    logger.info(f"[TIMER] Results and AP uploaded: {time.perf_counter() - t2:.4f}s")
     logger.info(f"Updated AP uploaded to results storage for dataset ID: {dataset_id}")
 
 
@@ -2377,16 +2839,57 @@ async def execute_query(wrapped: WrappedAPRequest, token: str):
     return AP_query_after, upload_path
 
 
+def _locate_query_result(dataset_id: str) -> tuple[Path, str]:
+    """Return the result CSV of `dataset_id` and an ETag derived from its stat"""
+    csv_path = get_results_csv_path(dataset_id)
+    stat_result = csv_path.stat()
+    return csv_path, f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+async def _stream_json_string(text_file: Any):
+    """
+    Yield the content of `text_file` encoded as a single JSON string.
+
+    The file is read chunk by chunk so a large query result is never held in
+    memory as a whole; the file is closed once the stream ends.
+    """
+    try:
+        yield b'"'
+        while chunk := await asyncio.to_thread(
+            text_file.read, QUERY_RESULT_STREAM_CHUNK_SIZE
+        ):
+            # Strip the quotes orjson puts around each encoded chunk
+            yield dumps_json(chunk)[1:-1]
+        yield b'"'
+    finally:
+        text_file.close()
+
+
 @router.get("/polyglot/query/result/{dataset_id}")
 async def get_query_result(
+        request: Request,
         dataset_id: str,
         token: str = Depends(security.oauth2_scheme),
         lines: Optional[int] = Query(None, alias="lines")
     ):
     """Endpoint to retrieve query results by dataset ID"""
     try:
-        results = get_results_uuid(dataset_id, line=lines)
-        return results
+        _, etag = await asyncio.to_thread(_locate_query_result, dataset_id)
+        headers = http_cache_headers(etag)
+        not_modified = not_modified_response(request, headers)
+        if not_modified is not None:
+            return not_modified
+
+        if lines is not None:
+            results = await asyncio.to_thread(get_results_uuid, dataset_id, line=lines)
+            return OrjsonResponse(results, headers=headers)
+        # Open before responding so a missing result is still reported as a 404
+        results_file = await asyncio.to_thread(open_results_uuid, dataset_id)
+        return StreamingResponse(
+            _stream_json_string(results_file),
+            media_type="application/json",
+            headers=headers,
+        )
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2399,67 +2902,68 @@ async def get_query_result(
         )
 
 
-@router.post("/in-dataset-discovery/text2sql", response_model=APResponseSuccessEnvelope)
-@router.post("/in-dataset-discovery/explore", response_model=APResponseSuccessEnvelope)
+@router.get("/polyglot/query/result/{dataset_id}/download")
+async def download_query_result(
+        request: Request,
+        dataset_id: str,
+        token: str = Depends(security.oauth2_scheme),
+    ):
+    """Endpoint to download the query result CSV of a dataset ID"""
+    try:
+        csv_path, etag = await asyncio.to_thread(_locate_query_result, dataset_id)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Result for dataset ID '{dataset_id}' not found.",
+        )
+    headers = http_cache_headers(etag)
+    not_modified = not_modified_response(request, headers)
+    if not_modified is not None:
+        return not_modified
+    # Served from disk in chunks, or handed to the server's zero-copy path when
+    # it supports it, instead of being loaded and JSON-encoded
+    return FileResponse(
+        csv_path, media_type="text/csv", filename=f"{dataset_id}.csv", headers=headers
+    )
+
+
+@router.post(
+    "/in-dataset-discovery/text2sql",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
+@router.post(
+    "/in-dataset-discovery/explore",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
 async def execute_and_store_idd(
     request: Request,
     file: Optional[UploadFile] = File(None),
     body: Optional[Dict[str, Any]] = Body(None),
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope),
-) -> APResponseSuccessEnvelope:
+    client: httpx.AsyncClient = Depends(get_service_client),
+    moma_client: httpx.AsyncClient = Depends(get_moma_client),
+) -> Response:
     """Generic handler: forward AP to the appropriate service, store it, return full response.
     Accepts AP in either format:
     - Multipart form with file upload: file=@path/to/file.json
     - JSON body: {"ap": {...}}
     """
-    # Strip the API prefix to get the route path
-    route_path = request.url.path.replace("/api/v1", "", 1)
-    if route_path not in EXTERNAL_SERVICES:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ErrorEnvelope(
-                code=status.HTTP_404_NOT_FOUND,
-                error=f"Unknown endpoint: {route_path}",
-            ).model_dump(exclude_none=True),
-        )
-    service = EXTERNAL_SERVICES[route_path]
+    service = resolve_external_service(request)
 
     # Parse payload from either file or JSON body
-    payload_data = None
-
-    if file:
-        # Read and parse the uploaded JSON file
-        content = await file.read()
-        try:
-            payload_data = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
-                    code=status.HTTP_400_BAD_REQUEST,
-                    error=f"Invalid JSON in uploaded file: {str(e)}",
-                ).model_dump(exclude_none=True),
-            )
-    elif body:
+    if body and not file:
         # Keep full JSON body so we preserve optional metadata keys if present.
         payload_data = body
     else:
-        # Fallback: manually try to parse JSON body if automatic parsing didn't work
-        try:
-            body_content = await request.body()
-            if body_content:
-                payload_data = json.loads(body_content)
-        except (json.JSONDecodeError, ValueError):
-            pass
+        payload_data = await read_uploaded_or_raw_json(request, file)
 
     if not isinstance(payload_data, dict) or not payload_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="Request must include a valid JSON payload as file upload or request body.",
-            ).model_dump(exclude_none=True),
+            detail=_ERR_MISSING_JSON_PAYLOAD,
         )
 
     # Accept both wrapped payloads ({"ap": {...}}) and raw AP JSON payloads.
@@ -2468,10 +2972,7 @@ async def execute_and_store_idd(
     if not isinstance(ap_payload, dict):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="The AP payload must be a JSON object.",
-            ).model_dump(exclude_none=True),
+            detail=_ERR_AP_NOT_OBJECT,
         )
 
     logger.info(
@@ -2480,123 +2981,95 @@ async def execute_and_store_idd(
     )
 
     try:
-        APRequest.model_validate(ap_payload)
+        ap = APRequest.model_validate(ap_payload)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_400_BAD_REQUEST,
                 error=f"Invalid AP payload: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
-    ap = add_sql_operators_to_ap(ap_payload)
+    # Reuse the validated AP instead of validating the payload a second time
+    ap = add_sql_operators_to_ap(ap)
     logger.info(
         f"Updated AP",
         ap=ap,
     )
-    normalized_ap = ap.model_dump(by_alias=True, exclude_defaults=True)
+    # Serialized by pydantic-core and embedded as-is in the request body
+    normalized_ap = raw_json(ap.model_dump_json(by_alias=True, exclude_defaults=True))
     if has_ap_wrapper:
         payload_data["ap"] = normalized_ap
     else:
         payload_data = {"ap": normalized_ap}
 
     try:
-        store_AP_in_grafeo(ap)
+        await asyncio.to_thread(store_AP_in_grafeo, ap)
     except Exception as e:
         print(f"[{service['name']}] AP Storage failed: {e}")
 
-    async with httpx.AsyncClient(
-        timeout=REQUEST_TIMEOUT_SECONDS, follow_redirects=True
-    ) as client:
-        response = await client.post(
-            service["url"],
-            headers={"Authorization": f"Bearer {token}"},
-            json=payload_data,
-        )
+    response = await client.post(
+        service["url"],
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        },
+        content=dumps_json(payload_data),
+    )
 
     try:
-        response_payload = response.json()
+        response_payload = loads_json(response.content)
     except ValueError:
         response_payload = {
             "status_code": response.status_code,
             "content": response.text,
         }
 
-    # If response is not successful, raise an error with context-aware messages
-    if response.status_code >= 400:
-        logger.error(
-            f"Error from {service['name']}",
-            status_code=response.status_code,
-            response_text=response.text,
-        )
-
-        # Extract error message and format it with service name and status code
-        if isinstance(response_payload, dict):
-            error_msg = response_payload.get("error", json.dumps(response_payload))
-        else:
-            error_msg = response.text
-
-        # Build context-specific error messages based on status code
-        status_messages = {
-            status.HTTP_401_UNAUTHORIZED: "Authentication failed. The token is invalid, expired, or missing.",
-            status.HTTP_403_FORBIDDEN: "Authorization failed. You lack the required role to perform this action.",
-            status.HTTP_424_FAILED_DEPENDENCY: "The service failed to communicate with a required dependency (OIDC provider, database, etc.).",
-            status.HTTP_500_INTERNAL_SERVER_ERROR: "An unexpected error occurred in the service while processing the request.",
-            status.HTTP_503_SERVICE_UNAVAILABLE: "The service is not ready. A core component may have failed during initialization.",
-        }
-
-        context_msg = status_messages.get(response.status_code, "")
-        error_message = (
-            f"{service['name']} returned error {response.status_code}: {error_msg}"
-        )
-        if context_msg:
-            error_message = f"{error_message} — {context_msg}"
+    raise_for_service_error(service, response, response_payload)
 
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=ErrorEnvelope(
-                code=response.status_code,
-                error=error_message,
-            ).model_dump(exclude_none=True),
+    ## Query execution
+    try:
+        executed_ap, upload_path = await execute_query(
+            WrappedAPRequest(ap=APRequest.model_validate(response_payload.get("ap", {}))),
+            token=token,
+            token_payload=token_payload,
+            client=moma_client,
+        )
+        return envelope_response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": f"In-Dataset and query executed successfully, results stored at {upload_path}",
+                "content": {"ap": raw_json(executed_ap.model_dump_json(by_alias=True, exclude_defaults=True)), "metadata": response_payload.get("metadata", {})},
+            }
         )
-    else:
-        ## Query execution
-        try:
-            executed_ap, upload_path = await execute_query(
-                WrappedAPRequest(ap=APRequest.model_validate(response_payload.get("ap", {}))),
-                token=token,
-            )
-            return APResponseSuccessEnvelope(
-                code=status.HTTP_200_OK,
-                message=f"In-Dataset and query executed successfully, results stored at {upload_path}",
-                content={"ap": executed_ap.model_dump(by_alias=True, exclude_defaults=True), "metadata": response_payload.get("metadata", {})},
-            )
 
-        except Exception as e:
-            # Build a partial success envelope
-            return APResponseSuccessEnvelope(
-                code=status.HTTP_207_MULTI_STATUS,   # or 200 if you prefer
-                message=f"In-Dataset executed successfully, but query execution failed: {str(e)}",
-                content={
+    except Exception as e:
+        # Build a partial success envelope
+        return envelope_response(
+            {
+                "code": status.HTTP_207_MULTI_STATUS,   # or 200 if you prefer
+                "message": f"In-Dataset executed successfully, but query execution failed: {str(e)}",
+                "content": {
                     "ap": response_payload.get("ap", {}),
                     "metadata": response_payload.get("metadata", {}),
                     "query_error": str(e),
                 },
-            )
+            }
+        )
 
 
 @router.get("/grafeo/test")
-async def grafeo_test():
+def grafeo_test():
     return run_grafeo_query("RETURN 1 as ok")
 
 def run_grafeo_query(query: str):
     url = "http://grafeo:7474/cypher"   # adjust to your endpoint
     payload = {"query": query}
     headers = {"Content-Type": "application/json"}
-    resp = requests.post(url, json=payload, headers=headers)
+    resp = requests.post(url, data=dumps_json(payload), headers=headers)
     resp.raise_for_status()
-    data = resp.json()
+    data = loads_json(resp.content)
     if "columns" in data and "rows" in data:
         return [dict(zip(data["columns"], row)) for row in data["rows"]]
     else:
@@ -2611,13 +3084,13 @@ def _run_grafeo_query_in_tx(txId, query: str):
     return data.get("rows", data)
 
 @router.post("/grafeo/query")
-async def grafeo_query(
+def grafeo_query(
     body: dict,
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope)
     ):
     query = body["query"]
-    return run_grafeo_query(query)
+    return OrjsonResponse(run_grafeo_query(query))
 
 @router.post("/aplog/store", 
              status_code=status.HTTP_201_CREATED,)
@@ -2634,50 +3107,44 @@ async def ap_storage(
     if body is None and file is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="You must provide either 'body' or 'file'.",
-            ).model_dump(exclude_none=True),
+            detail=_ERR_MISSING_BODY_OR_FILE,
         )
 
     if body is not None:
         try:
-            ap_dict = json.loads(body)
-            parsed_request = WrappedAPRequest.model_validate(ap_dict)
+            # pydantic-core parses and validates the JSON in a single pass
+            parsed_request = WrappedAPRequest.model_validate_json(body)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
+                detail=error_detail(
                     code=status.HTTP_400_BAD_REQUEST,
                     error=f"Invalid JSON: {e}",
-                ).model_dump(exclude_none=True),
+                ),
             )
     elif file is not None:
         content = await file.read()
         try:
-            ap_dict = json.loads(content)
-            parsed_request = WrappedAPRequest.model_validate(ap_dict)
+            # pydantic-core parses and validates the JSON in a single pass
+            parsed_request = WrappedAPRequest.model_validate_json(content)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ErrorEnvelope(
+                detail=error_detail(
                     code=status.HTTP_400_BAD_REQUEST,
                     error=f"Invalid file content: {e}",
-                ).model_dump(exclude_none=True),
+                ),
             )
 
     if parsed_request is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
-                code=status.HTTP_400_BAD_REQUEST,
-                error="Unable to parse request payload.",
-            ).model_dump(exclude_none=True),
+            detail=_ERR_UNPARSABLE_PAYLOAD,
         )
 
     payload_data = parsed_request.ap
     try:
-        store_AP_in_grafeo(payload_data)
+        await asyncio.to_thread(store_AP_in_grafeo, payload_data)
         return {
             "code": status.HTTP_201_CREATED,
             "message": "AP successfully stored in Grafeo",
@@ -2685,32 +3152,38 @@ async def ap_storage(
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_400_BAD_REQUEST,
                 error=str(e),
-            ).model_dump(exclude_none=True),
+            ),
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorEnvelope(
+            detail=error_detail(
                 code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 error=f"Failed to store AP in Grafeo: {str(e)}",
-            ).model_dump(exclude_none=True),
+            ),
         )
 
     
-@router.get("/aplog/get/{ap_id}")
-async def get_aplog(
+@router.get(
+    "/aplog/get/{ap_id}",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APResponseSuccessEnvelope}},
+)
+def get_aplog(
     ap_id: str, 
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope)):
 
     ap_graph = get_full_aplog(ap_id, token=token)
-    return APResponseSuccessEnvelope(
-        code=200,
-        message="success",
-        content=ap_graph
+    return envelope_response(
+        {
+            "code": 200,
+            "message": "success",
+            "content": ap_graph,
+        }
     )
 
 def get_full_aplog(ap_id: str, token, txId=None):
@@ -2769,8 +3242,12 @@ def get_full_aplog(ap_id: str, token, txId=None):
     )
     return ap_graph
 
-@router.get("/aplog/search")
-async def search_APs(
+@router.get(
+    "/aplog/search",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": APlogSuccessEnvelope}},
+)
+def search_APs(
         userId:Optional[List[str]] = Query(None),
         startDate:Optional[List[str]] = Query(None),
         endDate:Optional[List[str]] = Query(None),
@@ -2788,7 +3265,7 @@ async def search_APs(
     if endDate and len(endDate) > 1:
         raise HTTPException(status_code=400, detail="Only one endDate value is allowed")
     if operator:
-        allowed = [e.value for e in OPERATOR_LABELS]
+        allowed = _OPERATOR_LABEL_VALUES
 
         for op in operator:
             if op not in allowed:
@@ -2832,13 +3309,14 @@ async def search_APs(
         grafeo_rollback(txId)
     if len(response) == 0 :
         raise HTTPException(status_code=404, detail=f"No AP logs found with the input parameters.")
-    return APlogSuccessEnvelope(
-        code=200,
-        message=f"APlogs retrieved successfully with the input parameters.", 
-        aplogs= response,
-        count= len(response),
-        total=total
-
+    return envelope_response(
+        {
+            "code": 200,
+            "message": "APlogs retrieved successfully with the input parameters.",
+            "aplogs": response,
+            "count": len(response),
+            "total": total,
+        }
     )
 
 
@@ -2946,6 +3424,31 @@ def extract_alias(sql, args_map):
 
     return args_map
 
+def _local_csv_path(content_url: str) -> str:
+    """Map the S3 URL of a CSV source to the mounted path DuckDB reads it from"""
+    return content_url.replace("s3://dataset/", "/s3/dataset/")
+
+
+def _csv_source_stats(query_builder: Dict[str, Any]) -> tuple:
+    """
+    Return (path, st_mtime_ns, st_size) of every CSV source of a query (blocking).
+
+    Part of the query result cache key, so a source file rewritten by a load or
+    an update, possibly in another worker, is never answered from the cache.
+    """
+    stats = []
+    for arg_info in query_builder.get("args_map", {}).values():
+        if arg_info.get("mimeType") == "text/csv":
+            local_path = _local_csv_path(arg_info.get("contentUrl", ""))
+            stat_result = _stat_if_exists(Path(local_path))
+            stats.append(
+                (local_path, stat_result.st_mtime_ns, stat_result.st_size)
+                if stat_result is not None
+                else (local_path, None, None)
+            )
+    return tuple(stats)
+
+
 def write_views_minimal_extraction(query:str, args_maps:dict[str, dict]):
     tree = sqlglot.parse_one(query)
     optimized = optimize(tree)
@@ -2961,34 +3464,36 @@ def write_views_minimal_extraction(query:str, args_maps:dict[str, dict]):
                 db_connection = arg_info.get("dbConnection", {}).get("name", "Unknown DB")
                 pg_sql = f"SELECT * FROM {arg_info.get('contentUrl', '')}"
                 pg_sql_escaped = pg_sql.replace("'", "''")
-                view = f"""CREATE OR REPLACE VIEW {view_name} AS
+                view = f"""CREATE OR REPLACE TEMP VIEW {view_name} AS
                     SELECT *
                     FROM postgres_query(
                         '{db_connection}',
                         '{pg_sql_escaped}'
                     );"""
             if arg_info.get("mimeType") == "text/csv":
-                local_path = arg_info.get("contentUrl", "").replace("s3://dataset/", f"/s3/dataset/")
-                view = f"""CREATE OR REPLACE VIEW {view_name} AS
+                local_path = _local_csv_path(arg_info.get("contentUrl", ""))
+                local_path_escaped = local_path.replace("'", "''")
+                view = f"""CREATE OR REPLACE TEMP VIEW {view_name} AS
                     SELECT *
-                    FROM read_csv_auto('{local_path}');"""
+                    FROM read_csv_auto('{local_path_escaped}');"""
         else:    
             where_clause = " AND ".join(c for c in conds).replace(f'"{arg_info.get("alias")}".', "")
             if arg_info.get("mimeType") == "text/sql":
                 db_connection = arg_info.get("dbConnection", {}).get("name", "Unknown DB")
                 pg_sql = f"SELECT * FROM {arg_info.get('contentUrl', '')} WHERE {where_clause}"
                 pg_sql_escaped = pg_sql.replace("'", "''")
-                view = f"""CREATE OR REPLACE VIEW {view_name} AS
+                view = f"""CREATE OR REPLACE TEMP VIEW {view_name} AS
                     SELECT *
                     FROM postgres_query(
                         '{db_connection}',
                         '{pg_sql_escaped}'
                     );"""
             if arg_info.get("mimeType") == "text/csv":
-                local_path = arg_info.get("contentUrl", "").replace("s3://dataset/", f"/s3/dataset/")
-                view = f"""CREATE OR REPLACE VIEW {view_name} AS
+                local_path = _local_csv_path(arg_info.get("contentUrl", ""))
+                local_path_escaped = local_path.replace("'", "''")
+                view = f"""CREATE OR REPLACE TEMP VIEW {view_name} AS
                     SELECT *
-                    FROM read_csv_auto('{local_path}')
+                    FROM read_csv_auto('{local_path_escaped}')
                     WHERE {where_clause};"""
         args_maps[argname]["view"] = view
     return args_maps, optimized.sql()
@@ -3000,10 +3505,8 @@ def extract_filters_per_tables(tree):
             tables = {col.table for col in condition.find_all(exp.Column)}
             if len(tables) == 1:
                 for table in tables:
-                    if table not in filters:
-                        filters[table] = []
                     print("Condition:", condition.sql(), "Table:", table)
-                    filters[table].append(condition.sql())
+                    filters.setdefault(table, []).append(condition.sql())
     # JOIN filters
     for join in tree.find_all(exp.Join):
         on = join.args.get("on")
@@ -3012,10 +3515,8 @@ def extract_filters_per_tables(tree):
                 tables = {col.table for col in cond.find_all(exp.Column)}
                 if len(tables) == 1:
                     for t in tables:
-                        if t not in filters:
-                            filters[t] = []
                         print("Join Condition:", cond.sql(), "Table:", t)
-                        filters[t].append(cond.sql())
+                        filters.setdefault(t, []).append(cond.sql())
     return filters
 def split_conditions(expr):
     if isinstance(expr, exp.And):
@@ -3025,7 +3526,7 @@ def split_conditions(expr):
         yield expr
 
 @router.delete("/aplog/delete/{ap_id}", status_code=status.HTTP_200_OK)
-async def delete_aplog(
+def delete_aplog(
     ap_id: str,
     token: str = Depends(security.oauth2_scheme),
     token_payload: dict[str, Any] = Depends(security.require_app_scope)
@@ -47,7 +47,6 @@ class FailedDependencyException(HTTPException):
 logger = structlog.get_logger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 _oidc_config = None
-_jwks_keys = None
 _jwks_cache = None
 _jwks_cache_expires_at = 0
 
@@ -127,59 +126,6 @@ async def get_oidc_config():
     return _oidc_config
 
 
-async def get_jwks_keys():
-    """Fetches and caches the JSON Web Key Set (JWKS) containing public keys."""
-    global _jwks_keys
-    if _jwks_keys is None:
-        oidc_config = await get_oidc_config()
-        jwks_uri = oidc_config.get("jwks_uri")
-        if not jwks_uri:
-            raise FailedDependencyException(
-                source="OIDCProvider",
-                status_code=500,
-                detail="jwks_uri not found in OIDC config.",
-                correlation_id=get_correlation_id(),
-            )
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_uri)
-                response.raise_for_status()
-                _jwks_keys = response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "Failed to fetch JWKS keys due to HTTP error",
-                url=str(e.request.url),
-                status_code=e.response.status_code,
-                response=e.response.text,
-            )
-            try:
-                payload = e.response.json()
-            except Exception:
-                payload = e.response.text
-            raise FailedDependencyException(
-                source="OIDCProvider",
-                status_code=e.response.status_code,
-                correlation_id=get_correlation_id(),
-                payload=payload,
-                detail="Could not fetch public keys for token validation.",
-            )
-        except httpx.RequestError as e:
-            logger.error(
-                "Failed to fetch JWKS keys due to network error",
-                url=jwks_uri,
-                error=str(e),
-            )
-            raise FailedDependencyException(
-                source="OIDCProvider",
-                status_code=503,
-                correlation_id=get_correlation_id(),
-                payload={"error": f"Network error: {type(e).__name__}"},
-                detail="Could not fetch public keys for token validation.",
-            )
-    return _jwks_keys
-
-
 async def _exchange_token_for_cdd(user_token: str) -> str | None:
     """
     Performs the On-Behalf-Of token exchange to get a token for the Gateway.
@@ -6,10 +6,12 @@ import requests
 import structlog
 
 from dmm_api.tools.AP.parse_AP import APRequest, json_to_graph
+from dmm_api.tools.serialization import dumps_json, loads_json
 
 logger = structlog.get_logger(__name__)
 
 GRAFEO_URL = os.getenv("GRAFEO_URL", "http://localhost:7474")
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 ## The generated Grafeo queries will first check if the node id already exists, and if so, it will update the properties of the existing node instead of creating a new one. 
@@ -32,14 +34,18 @@ def AP_to_Grafeo(AP_payload: APRequest) -> dict:
         ],
     }
 
-    # Get AP id from the node with label "Analytical_Pattern" and property "id"
-    ap_node = next((node for node in grafeo_json["nodes"] if "Analytical_Pattern" in node["labels"]), None)
-    task_node = next((node for node in grafeo_json["nodes"] if "Task" in node["labels"]), None)
-    operator_nodes = [
-        node
-        for node in grafeo_json["nodes"]
-        if any(label == "Operator" or label.endswith("_Operator") for label in node.get("labels", []))
-    ]
+    # Get the first "Analytical_Pattern" and "Task" nodes and every Operator node
+    # in a single pass over the nodes
+    ap_node = task_node = None
+    operator_nodes = []
+    for node in grafeo_json["nodes"]:
+        labels = node["labels"]
+        if ap_node is None and "Analytical_Pattern" in labels:
+            ap_node = node
+        if task_node is None and "Task" in labels:
+            task_node = node
+        if any(label == "Operator" or label.endswith("_Operator") for label in labels):
+            operator_nodes.append(node)
     if not ap_node:
         raise ValueError("No AP node with id property found in the graph.")
     if not task_node:
@@ -189,30 +195,32 @@ def grafeo_begin():
         logger.warning("Grafeo transaction API not available; falling back to /cypher mode")
         return None
     resp.raise_for_status()
-    payload = resp.json()
+    payload = loads_json(resp.content)
     return payload.get("txId")
 
 def grafeo_execute(txId, query):
     if txId is None:
         resp = requests.post(
             f"{GRAFEO_URL}/cypher",
-            json={"query": query}
+            data=dumps_json({"query": query}),
+            headers=_JSON_HEADERS,
         )
         try:
             resp.raise_for_status()
         except requests.HTTPError as e:
             raise requests.HTTPError(f"{e}. Grafeo response: {resp.text}") from e
-        return resp.json()
+        return loads_json(resp.content)
 
     resp = requests.post(
         f"{GRAFEO_URL}/transaction/{txId}/execute",
-        json={"query": query}
+        data=dumps_json({"query": query}),
+        headers=_JSON_HEADERS,
     )
     try:
         resp.raise_for_status()
     except requests.HTTPError as e:
         raise requests.HTTPError(f"{e}. Grafeo response: {resp.text}") from e
-    return resp.json()
+    return loads_json(resp.content)
 
 def grafeo_commit(txId):
     if txId is None:
@@ -221,8 +221,8 @@ def extract_from_AP(
         - filtered_nodes: List of node dicts matching the target labels
         - filtered_edges: List of edge dicts connecting the filtered nodes
     """
-    # Convert AP to graph
-    graph = json_to_graph(ap_payload)
+    # Dump the AP once; labels are read from the same dicts that are returned
+    ap_data = ap_payload.model_dump(by_alias=True)
 
     # Default target labels if not provided
     if target_labels is None:
@@ -236,23 +236,16 @@ def extract_from_AP(
             "dg:DatabaseConnection",
         }
 
-    # Find nodes that have any of the target labels
-    filtered_node_ids: Set[str] = set()
-    for node_id, node_data in graph.nodes(data=True):
-        node_labels = set(node_data.get("labels", []))
-
-        # Check exact label matches
-        has_match = bool(node_labels & target_labels)
-
-        if has_match:
-            filtered_node_ids.add(node_id)
-
-    # Extract the original node and edge data from the AP payload
-    ap_data = ap_payload.model_dump(by_alias=True)
+    # Index nodes by ID (a repeated ID keeps its last definition, as in the graph)
     original_nodes = {node["id"]: node for node in ap_data["nodes"]}
 
-    # Build filtered nodes list
-    filtered_nodes = [original_nodes[node_id] for node_id in filtered_node_ids]
+    # Find nodes that have any of the target labels (exact label matches)
+    filtered_nodes = [
+        node
+        for node in original_nodes.values()
+        if not target_labels.isdisjoint(node.get("labels", []))
+    ]
+    filtered_node_ids: Set[str] = {node["id"] for node in filtered_nodes}
 
     # Build filtered edges list - include ALL edges between filtered nodes
     filtered_edges = []
@@ -2,24 +2,9 @@ import uuid
 import copy
 from dmm_api.tools.AP.parse_AP import APRequest, Edge, Node
 from datetime import datetime, timezone
+from typing import Optional
 
 
-# TODO: update the id for more than one dataset?
-# def update_dataset_id(
-#     ap_payload: APRequest, old_field: str, new_field: str
-# ) -> APRequest:
-#     for node in ap_payload.nodes:
-#         if str(node.id) == str(old_field) and "sc:Dataset" in node.labels:
-#             node.id = new_field
-
-#     for edge in ap_payload.edges:
-#         if str(edge.target) == str(old_field):
-#             edge.target = new_field
-#         if str(edge.source) == str(old_field):
-#             edge.source = new_field
-
-#     return ap_payload
-
 def update_fileObject_id(
     ap_payload: APRequest, old_field: str, new_field: str
 ) -> APRequest:
@@ -35,15 +20,18 @@ def update_fileObject_id(
     return ap_payload    
 
 
+# Returns the updated Dataset node as well, so callers don't have to look it up again
 def update_dataset_archivedAt(
     ap_payload: APRequest, dataset_id: str, new_path: str
-) -> APRequest:
+) -> tuple[APRequest, Optional[Node]]:
+    dataset_node = None
     for node in ap_payload.nodes:
         if str(node.id) == str(dataset_id) and "sc:Dataset" in node.labels:
-            if "properties" not in node.model_dump():
+            if node.properties is None:
                 node.properties = {}
             node.properties["archivedAt"] = new_path
-    return ap_payload
+            dataset_node = node
+    return ap_payload, dataset_node
 
 def update_fileObject_properties(
     ap_payload: APRequest, fileObject_id: str, new_path: str
@@ -60,16 +48,6 @@ def update_fileObject_properties(
             node.properties["sha256"] = "hash1234567890abcdef"
     return ap_payload
 
-# I want it to return APRequest and the new dataset id
-def update_output_dataset_id(ap_payload: APRequest) -> tuple[APRequest, str]:
-    output_edge = next((e for e in ap_payload.edges if "output" in e.labels), None)
-    if not output_edge:
-        raise ValueError("No edge with label 'output' found.")
-    old_dataset_id = output_edge.target
-    dataset_id = str(uuid.uuid4())
-    updated_AP = update_dataset_id(ap_payload, old_dataset_id, dataset_id)
-    return updated_AP, dataset_id
-
 def generate_dataset_node(ap_payload: APRequest) -> tuple[APRequest, str]:
     dataset_id = str(uuid.uuid4())
     new_dataset_node = Node(
@@ -96,7 +74,7 @@ def update_AP_after_query(
     updated_AP = update_fileObject_id(updated_AP, old_fileObject_id, fileObject_id)
     updated_AP = update_fileObject_properties(updated_AP,fileObject_id, s3_path)
 
-    updated_AP = update_dataset_archivedAt(updated_AP, dataset_id, s3_path)
+    updated_AP, _ = update_dataset_archivedAt(updated_AP, dataset_id, s3_path)
 
     new_edge = Edge(
         **{"from": dataset_id, "to": fileObject_id, "labels": ["distribution"]}
@@ -10,6 +10,10 @@ from dmm_api.tools.PG2Croissant.model import (
 
 logger = structlog.get_logger(__name__)
 
+# Shared default for nodes without properties, so the per-node lookups do not
+# allocate an empty dict. It is only read and must not be mutated.
+_NO_PROPERTIES: dict = {}
+
 
 def parse_profile(pgjson: dict) -> List[Dataset]:
     """Parse profile with optimized indexing"""
@@ -21,9 +25,9 @@ def parse_profile(pgjson: dict) -> List[Dataset]:
 
     datasets = []
     for node in pgjson.get("nodes", []):
-        if node.get("properties", {}).get("type") == "sc:Dataset":
+        dataset_properties = node.get("properties", _NO_PROPERTIES)
+        if dataset_properties.get("type") == "sc:Dataset":
             dataset_id = node.get("id")
-            dataset_properties = node.get("properties", {})
             logger.debug(f"Processing dataset: {dataset_id}")
 
             distribution = extract_distributions(
@@ -51,9 +55,7 @@ def _build_edge_index(edges: list) -> dict:
     for edge in edges:
         from_id = edge.get("from")
         if from_id:
-            if from_id not in edge_index:
-                edge_index[from_id] = []
-            edge_index[from_id].append(edge)
+            edge_index.setdefault(from_id, []).append(edge)
     return edge_index
 
 
@@ -76,14 +78,14 @@ def extract_fields(
                 logger.warning(f"Field node not found: {field_id}")
                 continue
 
-            field_properties = field_node.get("properties", {}).copy()
+            field_properties = field_node.get("properties", _NO_PROPERTIES).copy()
             statistics = extract_columnStatistics(
                 field_id=field_id, node_index=node_index, edge_index=edge_index
             )
             fileObject_id = extract_source(field_id=field_id, edge_index=edge_index)
 
             source = {
-                "extract": {"column": field_node.get("properties", {}).get("name", "")},
+                "extract": {"column": field_properties.get("name", "")},
                 "fileObject": {"@id": fileObject_id},
             }
             field_properties["source"] = source
@@ -178,7 +180,9 @@ def extract_distributions(
             fileObject_id = edge.get("to")
             fileObject_node = node_index.get(fileObject_id)
             if fileObject_node:
-                fileObject_properties = fileObject_node.get("properties", {}).copy()
+                fileObject_properties = fileObject_node.get(
+                    "properties", _NO_PROPERTIES
+                ).copy()
 
                 # Look for containedIn edge
                 for contained_edge in edge_index.get(fileObject_id, []):
@@ -2,21 +2,24 @@ import os
 from pathlib import Path
 
 
-def upload_dataset_to_catalogue(json_content: str, dataset_id: str) -> None:
+def upload_dataset_to_catalogue(json_content: str | bytes, dataset_id: str) -> None:
     """
-    Save a JSON-LD dataset string into the local catalogue directory.
+    Save a JSON-LD dataset document into the local catalogue directory.
 
     Args:
-        json_content (str): The dataset content as a JSON string.
+        json_content (str | bytes): The dataset content as a JSON string or
+            UTF-8 encoded bytes.
         dataset_id (str): Unique identifier for the dataset.
 
     Raises:
-        TypeError: If json_content is not a string.
+        TypeError: If json_content is neither a string nor bytes.
         RuntimeError: If writing to the catalogue fails.
     """
-    if not isinstance(json_content, str):
+    if isinstance(json_content, str):
+        json_content = json_content.encode("utf-8")
+    elif not isinstance(json_content, bytes):
         raise TypeError(
-            f"Expected JSON string for 'json_content', got {type(json_content).__name__}"
+            f"Expected JSON string or bytes for 'json_content', got {type(json_content).__name__}"
         )
 
     CATALOGUE_DIR = os.environ.get("CATALOGUE_DIR", "/s3/data-model-management")
@@ -29,7 +32,7 @@ def upload_dataset_to_catalogue(json_content: str, dataset_id: str) -> None:
 
         dataset_file = catalogue_folder / "dataset.json"
 
-        with open(dataset_file, "w", encoding="utf-8") as f:
+        with open(dataset_file, "wb") as f:
             f.write(json_content)
 
     except Exception as e:
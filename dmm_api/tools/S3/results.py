@@ -1,9 +1,9 @@
-from io import StringIO
-import json
 import os
 from pathlib import Path
-import csv
-from typing import Optional
+import shutil
+from typing import Optional, TextIO
+
+import pandas as pd
 
 
 RESULTS_DIR = os.environ.get("RESULTS_DIR", "/s3/data-model-management")
@@ -11,17 +11,20 @@ RESULTS_FOLDER = os.environ.get("RESULTS_FOLDER", "results")
 results_path = os.path.join(RESULTS_DIR, RESULTS_FOLDER.strip("/"))
 
 
-def upload_csv_to_results(file_content: bytes, dataset_id: str) -> tuple[str, str]:
+def get_results_folder(dataset_id: str) -> str:
+    return str(Path(results_path) / dataset_id)
+
+
+def upload_dataframe_to_results(df: pd.DataFrame, dataset_id: str) -> tuple[str, str]:
     try:
-        results_folder = Path(results_path) / dataset_id
+        results_folder = Path(get_results_folder(dataset_id))
         results_folder.mkdir(parents=True, exist_ok=True)
 
-        # Write the dataset file
+        # Stream the rows straight into the file instead of building the whole
+        # CSV in memory first
         dataset_file = results_folder / "output.csv"
         # NOTE: If file name exists we overwrite the file silently
-        with open(dataset_file, "wb") as f:
-            # Save bytes to file
-            f.write(file_content)
+        df.to_csv(dataset_file, index=False, encoding="utf-8")
 
         return str(results_folder), dataset_id
 
@@ -29,31 +32,63 @@ def upload_csv_to_results(file_content: bytes, dataset_id: str) -> tuple[str, st
         raise RuntimeError(f"Failed to upload dataset to results: {str(e)}")
 
 
-def upload_ap_to_results(ap_content: str, dataset_id: str) -> None:
+def upload_ap_to_results(ap_content: str | bytes, dataset_id: str) -> None:
     try:
-        results_folder = Path(results_path) / dataset_id
+        results_folder = Path(get_results_folder(dataset_id))
         results_folder.mkdir(parents=True, exist_ok=True)
 
+        if isinstance(ap_content, str):
+            ap_content = ap_content.encode("utf-8")
+
         # Write the AP file
         ap_file = results_folder / ".query_ap.json"
-        with open(ap_file, "w", encoding="utf-8") as f:
+        with open(ap_file, "wb") as f:
             f.write(ap_content)
 
     except Exception as e:
         raise RuntimeError(f"Failed to upload AP to results: {str(e)}")
 
-def get_results_uuid(dataset_id: str, line: Optional[int] = None ) -> str:
+
+def copy_results_csv(source_file: str, dataset_id: str) -> bool:
+    try:
+        results_folder = Path(get_results_folder(dataset_id))
+        results_folder.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source_file, results_folder / "output.csv")
+        return True
+
+    except FileNotFoundError:
+        # The source result was removed since it was written
+        return False
+    except Exception as e:
+        raise RuntimeError(f"Failed to copy cached result to results: {str(e)}")
+
+
+def remove_results(dataset_id: str) -> None:
+    shutil.rmtree(get_results_folder(dataset_id), ignore_errors=True)
+
+
+def get_results_csv_path(dataset_id: str) -> Path:
     results_folder = Path(results_path) / dataset_id
     if not results_folder.exists():
         raise FileNotFoundError(f"Results folder for dataset {dataset_id} not found.")
-    file = results_folder / "output.csv"
-    if line is not None:
-        lines = []
-        with file.open(encoding="utf-8") as f:
+    results_file = results_folder / "output.csv"
+    if not results_file.is_file():
+        raise FileNotFoundError(f"Results file for dataset {dataset_id} not found.")
+    return results_file
+
+
+def open_results_uuid(dataset_id: str) -> TextIO:
+    return get_results_csv_path(dataset_id).open(encoding="utf-8")
+
+
+def get_results_uuid(dataset_id: str, line: Optional[int] = None ) -> str:
+    with open_results_uuid(dataset_id) as f:
+        if line is not None:
+            lines = []
             for i, l in enumerate(f):
                 if i > line:
                     break
                 lines.append(l)
-        return "".join(lines)
+            return "".join(lines)
 
-    return file.read_text(encoding="utf-8")
\ No newline at end of file
+        return f.read()
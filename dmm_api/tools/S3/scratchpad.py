@@ -2,7 +2,7 @@
 This module provides utility functions for handling datasets in the scratchpad.
 
 Functions:
-    upload_dataset_to_scratchpad(dataset: bytes, file_name: str, dataset_id: str) -> str:
+    upload_dataset_to_scratchpad(dataset: bytes | BinaryIO, file_name: str, dataset_id: str) -> str:
         Uploads a dataset file to the scratchpad directory.
 
     save_croissant_to_scratchpad(dataset: Dict[str, Any], dataset_id: str) -> str:
@@ -11,18 +11,23 @@ Functions:
 
 import json
 import os
+import shutil
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, BinaryIO, Dict
+
+# Size of the chunks copied from an uploaded file to the scratchpad
+COPY_CHUNK_SIZE = 1024 * 1024
 
 
 def upload_dataset_to_scratchpad(
-    file_content: bytes, file_name: str, dataset_id: str
+    file_content: bytes | BinaryIO, file_name: str, dataset_id: str
 ) -> str:
     """
     Uploads a dataset file to the scratchpad directory.
 
     Args:
-        file_content (bytes): The dataset content in bytes.
+        file_content (bytes | BinaryIO): The dataset content in bytes, or a binary
+            file object that is copied in chunks so the upload is never held in memory.
         file_name (str): The name of the file to save in the scratchpad.
         dataset_id (str): The unique identifier for the dataset.
 
@@ -41,9 +46,11 @@ def upload_dataset_to_scratchpad(
         dataset_file = scratchpad_folder / file_name
 
         # NOTE: If file name exists we overwrite the file silently
-        with open(dataset_file, "w") as f:
-            # Save bytes to file
-            f.write(file_content.decode("utf-8"))
+        with open(dataset_file, "wb") as f:
+            if isinstance(file_content, bytes):
+                f.write(file_content)
+            else:
+                shutil.copyfileobj(file_content, f, COPY_CHUNK_SIZE)
 
         return str(scratchpad_folder)
     except Exception as e:
@@ -0,0 +1,101 @@
+"""
+In-process caching helpers for MoMa read-throughs.
+
+Classes:
+    TTLCache: A size-bounded LRU mapping whose entries expire after a fixed TTL.
+    SingleFlight: Coalesces concurrent identical async calls into one.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A size-bounded LRU cache whose entries expire after `ttl_seconds`.
+
+    Args:
+        maxsize (int): Maximum number of entries kept; the least recently used
+            entry is evicted when the cache is full.
+        ttl_seconds (float): Lifetime of an entry. A value <= 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key`, evicting the least recently used entry if full."""
+        if self.ttl_seconds <= 0 or self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present."""
+        self._entries.pop(key, None)
+
+    def pop_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every entry whose key satisfies `predicate`."""
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into a single execution.
+
+    The first caller for a key starts the coroutine in its own task; callers
+    arriving while it is still in flight await the same result (or exception)
+    instead of repeating the work. A cancelled caller only stops waiting, the
+    shared call keeps running for the others. Nothing is kept once the call
+    completes.
+    """
+
+    def __init__(self):
+        self._pending: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `fn()`, sharing it with concurrent calls for `key`."""
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._pending[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # Shield so a cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        # Only drop the entry if it still refers to this call
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._pending)
@@ -0,0 +1,110 @@
+"""
+JSON serialization helpers for documents written to S3 and HTTP bodies.
+
+Classes:
+    OrjsonResponse: A JSON response rendered with `dumps_json`.
+
+Functions:
+    dumps_json: Serialize an object to UTF-8 encoded JSON bytes.
+    json_etag: Compute an HTTP entity tag for a JSON-serializable object.
+    loads_json: Parse a JSON document.
+    raw_json: Embed an already serialized JSON document in `dumps_json` output.
+"""
+
+import hashlib
+import os
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+# Indent the documents written to S3 so they are easier to read when debugging
+DEBUG_PRETTY_JSON = os.getenv("DEBUG_PRETTY_JSON", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | (
+    orjson.OPT_INDENT_2 if DEBUG_PRETTY_JSON else 0
+)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    Serialize `obj` to compact UTF-8 encoded JSON.
+
+    Non-ASCII characters are written as-is. Output is indented when the
+    DEBUG_PRETTY_JSON environment variable is enabled.
+
+    Args:
+        obj (Any): The object to serialize.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    A JSON response rendered with `dumps_json` instead of the stdlib encoder.
+
+    The app's default response class. Endpoints also return it directly for
+    payloads that are already plain JSON, which skips FastAPI's
+    `jsonable_encoder` pass over them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def loads_json(data: bytes | str) -> Any:
+    """
+    Parse a JSON document with orjson.
+
+    Faster than `json.loads`/`httpx.Response.json()` on large payloads such as
+    MoMa dataset listings. Invalid input raises `orjson.JSONDecodeError`, a
+    subclass of `ValueError`.
+
+    Args:
+        data (bytes | str): The UTF-8 encoded JSON document.
+
+    Returns:
+        Any: The parsed object.
+    """
+    return orjson.loads(data)
+
+
+def raw_json(data: bytes | str) -> orjson.Fragment:
+    """
+    Wrap an already serialized JSON document so `dumps_json` embeds it verbatim.
+
+    Lets a Pydantic model serialized by `model_dump_json` (in Rust) be placed in
+    an envelope without first building a Python dict for orjson to walk again.
+    The document is not validated, so it must come from a JSON serializer.
+
+    Args:
+        data (bytes | str): The UTF-8 encoded JSON document.
+
+    Returns:
+        orjson.Fragment: The document, serialized as-is by `dumps_json`.
+    """
+    return orjson.Fragment(data)
+
+
+def json_etag(obj: Any) -> str:
+    """
+    Compute a strong HTTP ETag for a JSON-serializable object.
+
+    Keys are sorted before hashing, so equal documents get the same tag
+    regardless of key order.
+
+    Args:
+        obj (Any): The object to tag.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
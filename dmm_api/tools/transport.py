@@ -0,0 +1,83 @@
+"""
+httpx transport helpers for the outbound API clients.
+
+Classes:
+    BoundedTransport: Limits how many requests may be in flight at once.
+"""
+
+import asyncio
+from typing import Callable
+
+import httpx
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body stream that runs `release` once the body has been closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class BoundedTransport(httpx.AsyncBaseTransport):
+    """
+    Wrap a transport so that at most `max_inflight` requests run concurrently.
+
+    A request holds its slot until its response body has been read and closed,
+    so with HTTP/2 (where many requests share one connection and the pool
+    limits do not apply) the load sent upstream is still capped. Waiting for a
+    slot counts against the pool timeout of the request, like waiting for a
+    pooled connection, and raises httpx.PoolTimeout when it runs out.
+
+    Args:
+        transport (httpx.AsyncBaseTransport): The transport doing the actual I/O.
+        max_inflight (int): Maximum number of concurrent requests.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_inflight: int):
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_inflight)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool_timeout = request.extensions.get("timeout", {}).get("pool")
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), pool_timeout)
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout(
+                "Timed out waiting for a free request slot", request=request
+            )
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._semaphore.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        if response.is_closed:
+            # The body is already in memory and the client will not close the
+            # stream again, so the slot is freed right away
+            release()
+            return response
+
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,31 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from dmm_api.main import app
+from dmm_api.resources import dataset, security
+
+
+@pytest.fixture
+def moma_requests():
+    return []
+
+
+@pytest.fixture
+def api_client(moma_requests):
+    """Build a TestClient whose MoMa and service clients answer with `handler`."""
+
+    def make(handler):
+        def record(request):
+            moma_requests.append(request)
+            return handler(request)
+
+        moma_client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        app.dependency_overrides[security.oauth2_scheme] = lambda: "token"
+        app.dependency_overrides[security.require_app_scope] = lambda: {"sub": "user"}
+        app.dependency_overrides[dataset.get_moma_client] = lambda: moma_client
+        app.dependency_overrides[dataset.get_service_client] = lambda: moma_client
+        return TestClient(app)
+
+    yield make
+    app.dependency_overrides.clear()
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from dmm_api.tools import cache
+from dmm_api.tools.cache import SingleFlight, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expires_entries(clock):
+    ttl_cache = TTLCache(maxsize=4, ttl_seconds=10)
+    ttl_cache.set("key", "value")
+    clock[0] += 9
+    assert ttl_cache.get("key") == "value"
+    clock[0] += 1
+    assert ttl_cache.get("key") is None
+    assert len(ttl_cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl_seconds=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    assert ttl_cache.get("a") == 1
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+
+
+def test_ttl_cache_disabled_by_zero_ttl(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl_seconds=0)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") is None
+
+
+def test_ttl_cache_pop_matching(clock):
+    ttl_cache = TTLCache(maxsize=4, ttl_seconds=10)
+    for key in [("u", "a"), ("u", "b"), ("v", "a")]:
+        ttl_cache.set(key, True)
+    ttl_cache.pop_matching(lambda key: key[1] == "a")
+    assert len(ttl_cache) == 1
+    assert ttl_cache.get(("u", "b"))
+
+
+def test_single_flight_shares_concurrent_calls():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+        assert results == [1, 1, 1]
+        assert calls == 1
+        assert len(flight) == 0
+        # Nothing is kept once the call completes
+        assert await flight.do("key", work) == 2
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_shares_exceptions():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do("key", work) for _ in range(2)), return_exceptions=True
+        )
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert len(flight) == 0
+
+    asyncio.run(scenario())
+
+
+def test_single_flight_survives_cancelled_leader():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        release.set()
+        assert await follower == "result"
+        assert calls == 1
+        assert len(flight) == 0
+
+    asyncio.run(scenario())
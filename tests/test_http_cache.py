@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from dmm_api.resources import dataset
+from dmm_api.tools.S3 import results
+
+DATASET_ID = "c893daaf-680f-4947-88e5-03fd61900795"
+
+
+@pytest.fixture
+def client(api_client):
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={"nodes": [{"id": DATASET_ID, "labels": ["sc:Dataset"]}], "edges": []},
+        )
+
+    dataset.invalidate_dataset_caches([DATASET_ID])
+    yield api_client(handler)
+    dataset.invalidate_dataset_caches([DATASET_ID])
+
+
+def test_dataset_read_sends_private_cache_headers(client):
+    response = client.get(f"/api/v1/dataset/get/{DATASET_ID}")
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"].startswith("private, ")
+
+
+def test_dataset_read_if_none_match_returns_304(client, moma_requests):
+    etag = client.get(f"/api/v1/dataset/get/{DATASET_ID}").headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/dataset/get/{DATASET_ID}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"].startswith("private, ")
+    # The second read is answered from the in-process cache
+    assert len(moma_requests) == 1
+
+
+@pytest.mark.parametrize("if_none_match", ["W/{etag}", '"other", {etag}', "*"])
+def test_dataset_read_if_none_match_forms(client, if_none_match):
+    etag = client.get(f"/api/v1/dataset/get/{DATASET_ID}").headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/dataset/get/{DATASET_ID}",
+        headers={"If-None-Match": if_none_match.format(etag=etag)},
+    )
+    assert response.status_code == 304
+
+
+def test_dataset_read_stale_etag_returns_body(client):
+    response = client.get(
+        f"/api/v1/dataset/get/{DATASET_ID}", headers={"If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["dataset"]["nodes"][0]["id"] == DATASET_ID
+
+
+@pytest.fixture
+def query_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, "results_path", str(tmp_path))
+    (tmp_path / DATASET_ID).mkdir()
+    (tmp_path / DATASET_ID / "output.csv").write_text("a,b\n1,2\n")
+    return DATASET_ID
+
+
+@pytest.mark.parametrize("suffix", ["", "/download"])
+def test_query_result_if_none_match_returns_304(client, query_result, suffix):
+    url = f"/api/v1/polyglot/query/result/{query_result}{suffix}"
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"].startswith("private, ")
+
+
+def test_query_result_body(client, query_result):
+    response = client.get(f"/api/v1/polyglot/query/result/{query_result}")
+    assert response.json() == "a,b\n1,2\n"
@@ -0,0 +1,109 @@
+import json
+import uuid
+from pathlib import Path
+
+import httpx
+import pytest
+
+from dmm_api.resources import dataset
+
+REGISTER_AP = json.loads(
+    (Path(__file__).parent / "register" / "zoo.json").read_text(encoding="utf-8")
+)
+REGISTER_ID = next(
+    node["id"] for node in REGISTER_AP["ap"]["nodes"] if "sc:Dataset" in node["labels"]
+)
+
+
+def register_payload(dataset_id):
+    return json.loads(json.dumps(REGISTER_AP).replace(REGISTER_ID, dataset_id))
+
+
+def moma(existing=(), failing=(), search_status=200):
+    """MoMa mock knowing the `existing` datasets and failing to create `failing`."""
+
+    def handler(request):
+        if request.method == "GET":
+            if search_status != 200:
+                return httpx.Response(search_status, text="search failed")
+            ids = request.url.params.get_list("nodeIds")
+            return httpx.Response(
+                200, json={"datasets": [{"id": i} for i in ids if i in existing]}
+            )
+        dataset_id = json.loads(request.content)["nodes"][0]["id"]
+        if dataset_id in failing:
+            return httpx.Response(500, text="create failed")
+        return httpx.Response(201, json={})
+
+    return handler
+
+
+def methods(moma_requests):
+    return [request.method for request in moma_requests]
+
+
+def result_codes(response):
+    return [result["code"] for result in response.json()["content"]["results"]]
+
+
+def test_all_registered(api_client, moma_requests):
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    response = api_client(moma()).post(
+        "/api/v1/dataset/register_bulk", json=[register_payload(i) for i in ids]
+    )
+
+    assert response.status_code == 200
+    assert response.json()["code"] == 201
+    assert result_codes(response) == [201, 201, 201]
+    # One existence search for the whole batch, then one create per dataset
+    assert methods(moma_requests) == ["GET", "POST", "POST", "POST"]
+    assert set(moma_requests[0].url.params.get_list("nodeIds")) == set(ids)
+
+
+def test_per_dataset_outcomes(api_client, moma_requests):
+    existing, new, failing = (str(uuid.uuid4()) for _ in range(3))
+    payloads = [
+        register_payload(existing),
+        register_payload(new),
+        register_payload(new),
+        register_payload("not-a-uuid"),
+        register_payload(failing),
+    ]
+    response = api_client(moma(existing={existing}, failing={failing})).post(
+        "/api/v1/dataset/register_bulk", json=payloads
+    )
+
+    assert response.json()["code"] == 207
+    assert result_codes(response) == [409, 201, 409, 400, 502]
+    assert methods(moma_requests).count("POST") == 2
+
+
+def test_existence_check_failure_fails_request(api_client, moma_requests):
+    response = api_client(moma(search_status=500)).post(
+        "/api/v1/dataset/register_bulk", json=[register_payload(str(uuid.uuid4()))]
+    )
+
+    assert response.status_code == 502
+    assert methods(moma_requests) == ["GET"]
+
+
+def test_only_invalid_aps_skip_moma(api_client, moma_requests):
+    response = api_client(moma()).post(
+        "/api/v1/dataset/register_bulk", json=[register_payload("not-a-uuid")]
+    )
+
+    assert response.json()["code"] == 207
+    assert result_codes(response) == [400]
+    assert moma_requests == []
+
+
+@pytest.mark.parametrize("count", [0, 3])
+def test_batch_size_limits(api_client, moma_requests, monkeypatch, count):
+    monkeypatch.setattr(dataset, "REGISTER_BULK_MAX_DATASETS", 2)
+    response = api_client(moma()).post(
+        "/api/v1/dataset/register_bulk",
+        json=[register_payload(str(uuid.uuid4())) for _ in range(count)],
+    )
+
+    assert response.status_code == 400
+    assert moma_requests == []
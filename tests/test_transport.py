@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dmm_api.tools.transport import BoundedTransport
+
+
+def bounded_client(handler, max_inflight=1):
+    transport = BoundedTransport(
+        httpx.MockTransport(handler), max_inflight=max_inflight
+    )
+    return httpx.AsyncClient(transport=transport), transport
+
+
+async def chunks():
+    yield b"o"
+    yield b"k"
+
+
+def test_slot_held_until_stream_closed():
+    async def scenario():
+        client, transport = bounded_client(
+            lambda request: httpx.Response(200, content=chunks())
+        )
+        async with client:
+            async with client.stream("GET", "http://moma/a") as response:
+                assert response.status_code == 200
+                assert transport._semaphore.locked()
+                second = asyncio.create_task(client.get("http://moma/b"))
+                await asyncio.sleep(0.01)
+                assert not second.done()
+            assert (await asyncio.wait_for(second, 1)).text == "ok"
+            assert not transport._semaphore.locked()
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_on_error():
+    async def scenario():
+        def handler(request):
+            if request.url.path == "/down":
+                raise httpx.ConnectError("down", request=request)
+            return httpx.Response(200)
+
+        client, transport = bounded_client(handler)
+        async with client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("http://moma/down")
+            assert not transport._semaphore.locked()
+            response = await asyncio.wait_for(client.get("http://moma/up"), 1)
+            assert response.status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_for_read_body():
+    async def scenario():
+        client, transport = bounded_client(
+            lambda request: httpx.Response(200, text="ok")
+        )
+        async with client:
+            for _ in range(2):
+                response = await asyncio.wait_for(client.get("http://moma/a"), 1)
+                assert response.text == "ok"
+            assert not transport._semaphore.locked()
+
+    asyncio.run(scenario())
+
+
+def test_concurrency_capped():
+    async def scenario():
+        inflight = peak = 0
+
+        async def handler(request):
+            nonlocal inflight, peak
+            inflight += 1
+            peak = max(peak, inflight)
+            await asyncio.sleep(0.01)
+            inflight -= 1
+            return httpx.Response(200)
+
+        client, _ = bounded_client(handler, max_inflight=2)
+        async with client:
+            requests = (client.get(f"http://moma/{i}") for i in range(6))
+            await asyncio.wait_for(asyncio.gather(*requests), 1)
+        assert peak == 2
+
+    asyncio.run(scenario())
+
+
+def test_slot_wait_honours_pool_timeout():
+    async def scenario():
+        client, transport = bounded_client(
+            lambda request: httpx.Response(200, content=chunks())
+        )
+        async with client:
+            async with client.stream("GET", "http://moma/a"):
+                with pytest.raises(httpx.PoolTimeout):
+                    await asyncio.wait_for(
+                        client.get(
+                            "http://moma/b", timeout=httpx.Timeout(5, pool=0.05)
+                        ),
+                        1,
+                    )
+            assert not transport._semaphore.locked()
+
+    asyncio.run(scenario())